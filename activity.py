@@ -0,0 +1,127 @@
+"""
+Recent-activity collector for the README.
+
+Reads the user's own event stream (newest first) instead of every
+repository's events, stops paging as soon as it reaches an event it has
+already folded or one older than the window, and keeps a rolling
+aggregate keyed by "repo|date" on disk.  API calls and runtime depend on
+recent activity, not on how many repositories the account owns.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+
+ACTIVITY_FILE = 'assets/.activity.json'
+WINDOW_DAYS = 4
+TRACKED_TYPES = ('PushEvent', 'CreateEvent')
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+# ── Aggregate ────────────────────────────────────────────────────────────────
+
+def new_aggregate():
+    """
+    {'last_id': newest folded event id, 'entries': {key: entry}} where
+    each entry holds the push timestamps and first create timestamp
+    for one repo on one day.
+    """
+    return {'last_id': 0, 'entries': {}}
+
+
+def load_aggregate(path=ACTIVITY_FILE):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass                        # rebuilt from the event stream
+    return new_aggregate()
+
+
+def save_aggregate(aggregate, path=ACTIVITY_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(aggregate, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def fold(aggregate, event):
+    """Add one event to the aggregate (ignores untracked types)."""
+    aggregate['last_id'] = max(aggregate['last_id'], int(event['id']))
+    if event['type'] not in TRACKED_TYPES:
+        return
+
+    created_at = event['created_at']
+    repo_name = event['repo']['name']
+    day = created_at[:10]
+    entry = aggregate['entries'].setdefault(f'{repo_name}|{day}', {
+        'repo': repo_name, 'day': day, 'pushes': [], 'created': None,
+    })
+    if event['type'] == 'PushEvent':
+        entry['pushes'].append(created_at)
+    elif entry['created'] is None or created_at < entry['created']:
+        entry['created'] = created_at
+
+
+def prune(aggregate, cutoff):
+    """Drop activity older than `cutoff` (a TIME_FORMAT string)."""
+    for key, entry in list(aggregate['entries'].items()):
+        entry['pushes'] = [t for t in entry['pushes'] if t >= cutoff]
+        if entry['created'] and entry['created'] < cutoff:
+            entry['created'] = None
+        if not entry['pushes'] and entry['created'] is None:
+            del aggregate['entries'][key]
+
+
+def cutoff_for(now=None, days=WINDOW_DAYS):
+    return ((now or datetime.now()) - timedelta(days=days)).strftime(TIME_FORMAT)
+
+
+# ── Collection ───────────────────────────────────────────────────────────────
+
+def collect(client, username, aggregate=None, now=None, days=WINDOW_DAYS):
+    """
+    Fold the user's new events into `aggregate` (loaded from disk if None).
+
+    Pages through /users/{username}/events and stops at the first event
+    already folded or older than the window.  Returns (aggregate, new events).
+    """
+    aggregate = load_aggregate() if aggregate is None else aggregate
+    cutoff = cutoff_for(now, days)
+    last_id = aggregate['last_id']
+
+    new_events = 0
+    for event in client.iter_user_events(username):
+        if int(event['id']) <= last_id or event['created_at'] < cutoff:
+            break
+        fold(aggregate, event)
+        new_events += 1
+
+    prune(aggregate, cutoff)
+    return aggregate, new_events
+
+
+# ── Formatting ───────────────────────────────────────────────────────────────
+
+def format_activity(aggregate, limit=4):
+    """README lines for the `limit` most active repo/day pairs."""
+    def count(entry):
+        return len(entry['pushes']) or 1
+
+    # Most active first, newest day breaking ties
+    entries = sorted(aggregate['entries'].values(),
+                     key=lambda e: (count(e), e['day'], e['repo']), reverse=True)
+
+    lines = []
+    for entry in entries[:limit]:
+        date = datetime.strptime(entry['day'], '%Y-%m-%d').strftime('%B %d, %Y')
+        if len(entry['pushes']) > 1:
+            lines.append(f"- Pushed to {entry['repo']} ({count(entry)} times) on {date}")
+        elif entry['pushes']:
+            lines.append(f"- Pushed to {entry['repo']} on {date}")
+        else:
+            lines.append(f"- Created {entry['repo']} on {date}")
+    return lines
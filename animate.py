@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Animated day-cycle export for the Triadic Balloon.
+
+Renders the full 24-hour journey (optionally with interpolated sub-hour
+steps) into one animated APNG, WebP or GIF.
+
+The background and cityscape only change between acts, so each frame is
+derived incrementally from the previous one and for APNG we know its
+dirty rectangle up front: the union of the previous and next balloon /
+accent / signature footprints.  Only that crop is
+encoded per frame (fcTL + fdAT with APNG_DISPOSE_OP_NONE /
+APNG_BLEND_OP_SOURCE); a full frame is written only when the act
+changes.  WebP and GIF go through Pillow's own animated encoders,
+which do their own sub-frame optimisation.
+
+Usage:
+    python animate.py day.png --day 42 --steps 4 --duration 200
+"""
+
+import argparse
+import io
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+from bauhaus_generator import balloon_geometry, compose_frame, get_journey
+from incremental import union, update_frame
+
+
+AnimFrame = namedtuple('AnimFrame', 'image dirty duration')
+
+
+# ── Frame sequence ───────────────────────────────────────────────────────────
+
+def day_frames(day_seed, width=1200, height=300, steps_per_hour=1,
+               duration=250):
+    """
+    Yield AnimFrames for the whole day.
+
+    Each frame is derived from the previous one with
+    `incremental.update_frame`; `dirty` is the PIL box that differs from
+    the previous frame (the full canvas at the start and on act changes).
+    """
+    journey = get_journey(width, height)
+    prev = None
+
+    for t, x, y, scale in journey.steps(steps_per_hour):
+        hour = int(t)
+        if t == hour:
+            balloon = journey.balloon(hour)
+        else:
+            balloon = balloon_geometry(x, y, scale)
+
+        if prev is None:
+            img = compose_frame(hour, day_seed, width, height, balloon=balloon)
+            dirty = (0, 0, width, height)
+        else:
+            img, boxes = update_frame(prev[0], prev[1], hour, day_seed,
+                                      prev[2], balloon, in_place=False)
+            dirty = union(boxes)
+        prev = (img, hour, balloon)
+        yield AnimFrame(img, dirty, duration)
+
+
+# ── APNG writer ──────────────────────────────────────────────────────────────
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+
+def _idat_payload(img, compress_level):
+    """Let Pillow encode `img` as a PNG and return its concatenated IDAT data."""
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', compress_level=compress_level)
+    data = buf.getvalue()
+    pos, out = 8, []
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        if kind == b'IDAT':
+            out.append(data[pos + 8:pos + 8 + length])
+        pos += 12 + length
+    return b''.join(out)
+
+
+def write_apng(frames, path, loop=0, compress_level=6):
+    """
+    Write AnimFrames as an APNG that only stores each frame's dirty crop.
+
+    Returns the number of bytes written.
+    """
+    frames = list(frames)
+    width, height = frames[0].image.size
+    out = [b'\x89PNG\r\n\x1a\n',
+           _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)),
+           _chunk(b'acTL', struct.pack('>II', len(frames), loop))]
+
+    seq = 0
+    for i, frame in enumerate(frames):
+        x0, y0, x1, y1 = (0, 0, width, height) if i == 0 else frame.dirty
+        out.append(_chunk(b'fcTL', struct.pack(
+            '>IIIIIHHBB', seq, x1 - x0, y1 - y0, x0, y0,
+            frame.duration, 1000,
+            0,      # APNG_DISPOSE_OP_NONE: keep the canvas for the next delta
+            0,      # APNG_BLEND_OP_SOURCE: overwrite the dirty rect
+        )))
+        seq += 1
+        crop = frame.image if i == 0 else frame.image.crop((x0, y0, x1, y1))
+        payload = _idat_payload(crop, compress_level)
+        if i == 0:
+            out.append(_chunk(b'IDAT', payload))
+        else:
+            out.append(_chunk(b'fdAT', struct.pack('>I', seq) + payload))
+            seq += 1
+    out.append(_chunk(b'IEND', b''))
+
+    data = b''.join(out)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+# ── Export ───────────────────────────────────────────────────────────────────
+
+def export_day(path, day_seed, width=1200, height=300, steps_per_hour=1,
+               duration=250, loop=0):
+    """
+    Export the day as an animation; format follows the file extension
+    (.png/.apng → APNG with dirty-rect frames, .webp, .gif).
+
+    Returns (frame_count, bytes_written).
+    """
+    frames = list(day_frames(day_seed, width, height, steps_per_hour, duration))
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext in ('.png', '.apng'):
+        return len(frames), write_apng(frames, path, loop=loop)
+
+    images = [f.image for f in frames]
+    options = dict(save_all=True, append_images=images[1:],
+                   duration=duration, loop=loop)
+    if ext == '.webp':
+        options.update(lossless=True, minimize_size=True)
+    elif ext == '.gif':
+        options.update(optimize=True, disposal=1)
+    else:
+        raise ValueError(f"Unsupported animation format: {ext!r}")
+    images[0].save(path, **options)
+    return len(frames), os.path.getsize(path)
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description='Export the day as an animation.')
+    parser.add_argument('path', help='output file (.png/.apng, .webp or .gif)')
+    parser.add_argument('--day', type=int, default=None,
+                        help='day seed (default: today\'s day-of-year)')
+    parser.add_argument('--steps', type=int, default=1,
+                        help='frames per hour (interpolated balloon motion)')
+    parser.add_argument('--duration', type=int, default=250, help='ms per frame')
+    parser.add_argument('--width', type=int, default=1200)
+    parser.add_argument('--height', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    day_seed = args.day or datetime.now().timetuple().tm_yday
+    start = time.perf_counter()
+    count, nbytes = export_day(args.path, day_seed, args.width, args.height,
+                               args.steps, args.duration)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.path}: {count} frames, {nbytes / 1024:.1f} KB "
+          f"in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Batch renderer for the Triadic Balloon journey.
+
+Spreads frame generation + PNG encoding for whole days or date ranges
+across a process pool.  Results stream back in job order, so a year of
+frames (8,760 images) can be written while progress is reported.
+Workers render through the scene/indexed path (`png_encode.encode_frame`),
+so what a worker reuses between frames is scene.py's recorded layers,
+not the raster base layers of bauhaus_generator.
+
+Usage:
+    python batch_render.py 2026-01-01 2026-12-31 --workers 8 --out archive
+"""
+
+import argparse
+import math
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from functools import partial
+
+
+DEFAULT_NAME = 'triadic_{date:%Y%m%d}_h{hour:02d}.png'
+
+FrameJob = namedtuple('FrameJob', 'path hour day_seed width height')
+FrameResult = namedtuple('FrameResult', 'path hour day_seed nbytes seconds')
+
+
+# ── Worker ───────────────────────────────────────────────────────────────────
+
+def _render_job(job, preset='default'):
+    """Render and encode one frame.  Runs inside a worker process."""
+    from png_encode import encode_frame, write_encoded
+
+    start = time.perf_counter()
+    encoded = encode_frame(job.hour, job.day_seed, job.width, job.height, preset)
+    write_encoded(encoded, job.path)
+    return FrameResult(
+        job.path, job.hour, job.day_seed,
+        len(encoded.data), time.perf_counter() - start,
+    )
+
+
+# ── Job planning ─────────────────────────────────────────────────────────────
+
+def iter_dates(start_date, end_date):
+    """Yield every date from start_date to end_date, inclusive."""
+    day = start_date
+    while day <= end_date:
+        yield day
+        day += timedelta(days=1)
+
+
+def plan_range(start_date, end_date, hours=range(24), out_dir='test_frames',
+               name=DEFAULT_NAME, width=1200, height=300):
+    """
+    Build the job list for a date range.
+
+    Jobs are ordered day by day, so consecutive hours of a day land in
+    the same worker chunk and record each act's skyline once: scene.py
+    caches the city layer per (act, day_seed, width, height).
+    """
+    from bauhaus_generator import get_act
+
+    jobs = []
+    for day in iter_dates(start_date, end_date):
+        day_seed = day.timetuple().tm_yday
+        for hour in hours:
+            filename = name.format(date=day, hour=hour, act=get_act(hour),
+                                   day_seed=day_seed)
+            jobs.append(FrameJob(os.path.join(out_dir, filename),
+                                 hour, day_seed, width, height))
+    return jobs
+
+
+# ── Execution ────────────────────────────────────────────────────────────────
+
+def render_frames(jobs, workers=None, chunksize=24, preset='default'):
+    """
+    Render a list of FrameJobs, yielding FrameResults in job order.
+
+    Args:
+        jobs:      Sequence of FrameJob
+        workers:   Process count.  None → os.cpu_count(); 1 → in-process
+        chunksize: Jobs handed to a worker at a time (24 = one day); fewer
+                   jobs than that are split evenly across the workers
+        preset:    png_encode preset ('fast' / 'default' / 'small')
+    """
+    jobs = list(jobs)
+    for d in {os.path.dirname(j.path) for j in jobs}:
+        if d:
+            os.makedirs(d, exist_ok=True)
+
+    render = partial(_render_job, preset=preset)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield render(job)
+        return
+
+    if len(jobs) <= chunksize:
+        chunksize = math.ceil(len(jobs) / workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render, jobs, chunksize=chunksize)
+
+
+def render_range(start_date, end_date, hours=range(24), workers=None,
+                 out_dir='test_frames', name=DEFAULT_NAME,
+                 width=1200, height=300, preset='default'):
+    """
+    Render every requested hour of every day in [start_date, end_date].
+
+    Yields FrameResults in date/hour order as they complete.
+    """
+    hours = list(hours)
+    jobs = plan_range(start_date, end_date, hours, out_dir, name, width, height)
+    # one chunk per day: a worker records that day's skylines only once
+    return render_frames(jobs, workers=workers, chunksize=max(1, len(hours)),
+                         preset=preset)
+
+
+def render_day(day, hours=range(24), workers=None, **kwargs):
+    """Render the frames of a single day."""
+    return render_range(day, day, hours=hours, workers=workers, **kwargs)
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def _parse_hours(text):
+    """Parse '0-23' or '0,6,12,18' into a list of hours."""
+    hours = []
+    for part in text.split(','):
+        if '-' in part:
+            lo, hi = part.split('-')
+            hours.extend(range(int(lo), int(hi) + 1))
+        else:
+            hours.append(int(part))
+    return hours
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('start', type=date.fromisoformat, help='first day (YYYY-MM-DD)')
+    parser.add_argument('end', type=date.fromisoformat, nargs='?',
+                        help='last day, inclusive (default: start)')
+    parser.add_argument('--hours', type=_parse_hours, default=list(range(24)),
+                        help="hours to render, e.g. '0-23' or '0,12,23'")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--out', default='test_frames', help='output folder')
+    parser.add_argument('--width', type=int, default=1200)
+    parser.add_argument('--height', type=int, default=300)
+    parser.add_argument('--preset', choices=('fast', 'default', 'small'), default='default',
+                        help='PNG compression preset (default: default)')
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = total_bytes = 0
+    for result in render_range(args.start, args.end or args.start, args.hours,
+                               workers=args.workers, out_dir=args.out,
+                               width=args.width, height=args.height,
+                               preset=args.preset):
+        count += 1
+        total_bytes += result.nbytes
+        if not args.quiet:
+            print(f"  {result.path}  ({result.nbytes / 1024:.1f} KB, "
+                  f"{result.seconds * 1000:.1f} ms)")
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Rendered {count} frames in {elapsed:.2f}s "
+          f"({rate:.1f} frames/s, {total_bytes / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
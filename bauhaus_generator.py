@@ -19,10 +19,22 @@ Acts (after Schlemmer):
 """
 
 import math
+import os
 import random
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
 from datetime import datetime
+from functools import lru_cache
 from PIL import Image, ImageDraw
 
+import instrument
+
+
+# Bump whenever a change alters the rendered output, so content-addressed
+# frames (see frame_store.py) are re-rendered instead of reused.
+GENERATOR_VERSION = 1
+
 
 # ── Bauhaus primary palette ──────────────────────────────────────────────────
 
@@ -119,8 +131,87 @@ def get_balloon_position(hour, width=1200, height=300):
     return x, y, scale
 
 
+# ── Journey timeline ─────────────────────────────────────────────────────────
+
+FINALE_SCALE = 0.55         # the arrived balloon shrinks beside the mn+
+
+
+class Journey:
+    """
+    Precomputed 24-hour trajectory for one canvas size.
+
+    Holds per-hour x, y, scale (compact float arrays), act names and
+    balloon geometry, so a frame needs table reads instead of trig.
+    `at()` interpolates between hours for sub-hour animation.
+    """
+
+    __slots__ = ('width', 'height', 'x', 'y', 'scale', 'acts', 'balloons')
+
+    def __init__(self, width=1200, height=300):
+        self.width = width
+        self.height = height
+        positions = [get_balloon_position(h, width, height) for h in range(24)]
+        self.x = array('d', (p[0] for p in positions))
+        self.y = array('d', (p[1] for p in positions))
+        self.scale = array('d', (p[2] for p in positions))
+        self.acts = tuple(get_act(h) for h in range(24))
+        self.balloons = tuple(
+            balloon_geometry(x, y, s * FINALE_SCALE if h == 23 else s)
+            for h, (x, y, s) in enumerate(positions)
+        )
+
+    def position(self, hour):
+        """(x, y, scale) for an integer hour."""
+        return self.x[hour], self.y[hour], self.scale[hour]
+
+    def act(self, hour):
+        return self.acts[hour]
+
+    def balloon(self, hour):
+        """BalloonGeometry for an integer hour (finale scale at hour 23)."""
+        return self.balloons[hour]
+
+    def fine_balloon(self, hour, k):
+        """The hour's balloon laid out on a k× grid, for supersampling."""
+        x, y, s = self.position(hour)
+        return balloon_geometry(x, y, s * FINALE_SCALE if hour == 23 else s, k)
+
+    def at(self, t):
+        """
+        Interpolated (x, y, scale) for a fractional hour 0.0 – 23.0.
+
+        The scale is the one drawn: across hour 22 it eases toward the
+        finale's shrunk balloon, so the last step does not pop.
+        """
+        t = min(max(t, 0.0), 23.0)
+        h = int(t)
+        if h == 23:
+            x, y, s = self.position(23)
+            return x, y, s * FINALE_SCALE
+        f = t - h
+        end = self.scale[h + 1] * (FINALE_SCALE if h == 22 else 1.0)
+        return (
+            self.x[h] + (self.x[h + 1] - self.x[h]) * f,
+            self.y[h] + (self.y[h + 1] - self.y[h]) * f,
+            self.scale[h] + (end - self.scale[h]) * f,
+        )
+
+    def steps(self, per_hour=1):
+        """Yield (t, x, y, scale) at `per_hour` evenly spaced steps per hour."""
+        for i in range(23 * per_hour + 1):
+            t = i / per_hour
+            yield (t,) + self.at(t)
+
+
+@lru_cache(maxsize=8)
+def get_journey(width=1200, height=300):
+    """Shared Journey for a canvas size."""
+    return Journey(width, height)
+
+
 # ── Drawing: background ─────────────────────────────────────────────────────
 
+@instrument.timed('draw.background', counts_draw=True)
 def draw_background(draw, width, height, act):
     """Two-tone background with a thin Bauhaus divider line."""
     third = height // 3
@@ -132,12 +223,57 @@ def draw_background(draw, width, height, act):
 
 # ── Drawing: cityscape ──────────────────────────────────────────────────────
 
-def _building_color(base, rng, variance=25):
-    """Return a color near `base` with random variance."""
-    return tuple(
-        max(0, min(255, c + rng.randint(-variance, variance)))
-        for c in base
-    )
+CITY_CACHE_SIZE = 32        # a few hundred bytes per (day, width)
+INT16_MAX = 32767
+
+# One day's skyline, colour-free: structure-of-arrays in int16 (x widens to
+# int32 on canvases over 32767 px).  Buildings are back layer, then front
+# layer, then spires; `offsets` holds the per-channel variance (r, g, b) of
+# each back/front building, added to whichever act's city_base is drawn.
+CityGeometry = namedtuple('CityGeometry', 'x w h offsets back front spires')
+
+
+@lru_cache(maxsize=CITY_CACHE_SIZE)
+def city_geometry(day_seed, width):
+    """
+    Skyline for a day, drawn from the same seeded stream as always.
+
+    Only the geometry depends on (day_seed, width); the 24 frames of a
+    day share it and the act just recolours it.  Heights are measured up
+    from the ground, so the canvas height is not part of the key.
+    """
+    rng = random.Random(day_seed)
+    x = array('h' if width <= INT16_MAX else 'i')
+    w, h, offsets = array('h'), array('h'), array('h')
+
+    def building(widths, heights, variance=None):
+        bw = rng.randint(*widths)
+        bh = rng.randint(*heights)
+        x.append(rng.randint(0, width - bw))
+        w.append(bw)
+        h.append(bh)
+        if variance:
+            offsets.extend(rng.randint(-variance, variance) for _ in range(3))
+
+    back = rng.randint(10, 16)              # tall, lighter
+    for _ in range(back):
+        building((30, 70), (45, 80), variance=18)
+    front = rng.randint(8, 14)              # shorter, darker
+    for _ in range(front):
+        building((20, 55), (25, 55), variance=12)
+    spires = rng.randint(2, 4)              # tall, narrow, act accent
+    for _ in range(spires):
+        building((8, 18), (55, 85))
+    return CityGeometry(x, w, h, offsets, back, front, spires)
+
+
+@lru_cache(maxsize=CITY_CACHE_SIZE * 4)
+def city_colors(day_seed, width, base):
+    """Fill of every back/front building for a `city_base`, channel by channel."""
+    offsets = city_geometry(day_seed, width).offsets
+    channels = [[max(0, min(255, b + o)) for o in offsets[c::3]]
+                for c, b in enumerate(base)]
+    return tuple(zip(*channels))
 
 
 def _muted(color, base):
@@ -145,56 +281,63 @@ def _muted(color, base):
     return tuple((a + b) // 2 for a, b in zip(color, base))
 
 
+@instrument.timed('draw.cityscape', counts_draw=True)
 def draw_cityscape(draw, width, height, day_seed, act):
     """
     Feininger-inspired geometric skyline along the bottom ~80 px.
     Seeded by day-of-year so it stays consistent within a single day.
     """
-    rng = random.Random(day_seed)
     ground_h = 22
     city_floor = height - ground_h
     base = act['city_base']
+    g = city_geometry(day_seed, width)
+    colors = city_colors(day_seed, width, base)
+    accent_muted = _muted(act['city_accent'], base)
 
     # ground plane
     draw.rectangle([0, city_floor, width, height], fill=base)
 
-    # buildings — back layer (tall, lighter)
-    buildings_back = []
-    for _ in range(rng.randint(10, 16)):
-        bw = rng.randint(30, 70)
-        bh = rng.randint(45, 80)
-        bx = rng.randint(0, width - bw)
-        color = _building_color(base, rng, variance=18)
-        buildings_back.append((bx, city_floor - bh, bx + bw, city_floor, color))
-
-    for b in buildings_back:
-        draw.rectangle([b[0], b[1], b[2], b[3]], fill=b[4], outline=BLACK, width=1)
-
-    # buildings — front layer (shorter, darker)
-    for _ in range(rng.randint(8, 14)):
-        bw = rng.randint(20, 55)
-        bh = rng.randint(25, 55)
-        bx = rng.randint(0, width - bw)
-        color = _building_color(base, rng, variance=12)
+    # buildings back to front, then the accent spires
+    for i, (bx, bw, bh) in enumerate(zip(g.x, g.w, g.h)):
         draw.rectangle(
             [bx, city_floor - bh, bx + bw, city_floor],
-            fill=color, outline=BLACK, width=1,
-        )
-
-    # accent spires — tall, narrow, in the act's primary color (muted)
-    accent_muted = _muted(act['city_accent'], base)
-    for _ in range(rng.randint(2, 4)):
-        sw = rng.randint(8, 18)
-        sh = rng.randint(55, 85)
-        sx = rng.randint(0, width - sw)
-        draw.rectangle(
-            [sx, city_floor - sh, sx + sw, city_floor],
-            fill=accent_muted, outline=BLACK, width=1,
+            fill=colors[i] if i < len(colors) else accent_muted,
+            outline=BLACK, width=1,
         )
 
 
 # ── Drawing: diamond balloon ────────────────────────────────────────────────
 
+BalloonGeometry = namedtuple(
+    'BalloonGeometry',
+    'cx cy half_w half_h rows_per_half row_h accent string_len basket_w basket_h',
+)
+
+
+def balloon_geometry(x, y, scale, k=1):
+    """
+    Integer layout of the diamond balloon for a position and scale.
+
+    `k` lays it out on a k-times finer grid for supersampling: every
+    length is scaled before rounding, the envelope keeps its row count.
+    """
+    half_w = int(38 * scale * k)
+    half_h = int(48 * scale * k)
+    rows_per_half = max(4, int(8 * scale))
+    return BalloonGeometry(
+        cx=int(x * k),
+        cy=int(y * k + half_h),            # equator of the diamond
+        half_w=half_w,
+        half_h=half_h,
+        rows_per_half=rows_per_half,
+        row_h=max(2 * k, int(half_h / rows_per_half)),
+        accent=max(3 * k, int(8 * scale * k)),
+        string_len=max(10 * k, int(22 * scale * k)),
+        basket_w=max(5 * k, int(12 * scale * k)),
+        basket_h=max(3 * k, int(6 * scale * k)),
+    )
+
+
 def draw_balloon(draw, x, y, scale, act):
     """
     Bauhaus diamond / kite balloon.
@@ -205,62 +348,64 @@ def draw_balloon(draw, x, y, scale, act):
     A small accent square sits at the equator.
     A string leads down to a rectangular basket.
     """
+    paint_balloon(draw, balloon_geometry(x, y, scale), act)
+
+
+@instrument.timed('draw.balloon', counts_draw=True)
+def paint_balloon(draw, g, act, line=1):
+    """Draw a balloon from a precomputed BalloonGeometry (`line`-px outlines)."""
     top_color = act['balloon_top']
     bot_color = act['balloon_bot']
     acc_color = act['accent']
 
-    half_w = int(38 * scale)
-    half_h = int(48 * scale)
-    cx = int(x)
-    cy = int(y + half_h)                   # equator of the diamond
-
-    rows_per_half = max(4, int(8 * scale))
-    row_h = max(2, int(half_h / rows_per_half))
+    cx, cy = g.cx, g.cy
+    half_w, half_h = g.half_w, g.half_h
+    rows_per_half, row_h = g.rows_per_half, g.row_h
 
     # ── upper half (tapers up) ──
     for i in range(rows_per_half):
         frac = (i + 1) / rows_per_half
-        rw = max(2, int(half_w * frac))
+        rw = max(2 * line, int(half_w * frac))
         ry = cy - half_h + i * row_h
         draw.rectangle(
             [cx - rw, ry, cx + rw, ry + row_h],
-            fill=top_color, outline=BLACK, width=1,
+            fill=top_color, outline=BLACK, width=line,
         )
 
     # ── lower half (tapers down) ──
     for i in range(rows_per_half):
         frac = max(0.08, 1.0 - (i + 1) / rows_per_half)
-        rw = max(2, int(half_w * frac))
+        rw = max(2 * line, int(half_w * frac))
         ry = cy + i * row_h
         draw.rectangle(
             [cx - rw, ry, cx + rw, ry + row_h],
-            fill=bot_color, outline=BLACK, width=1,
+            fill=bot_color, outline=BLACK, width=line,
         )
 
     # ── accent square at equator ──
-    a = max(3, int(8 * scale))
+    a = g.accent
     draw.rectangle(
         [cx - a, cy - a, cx + a, cy + a],
-        fill=acc_color, outline=BLACK, width=1,
+        fill=acc_color, outline=BLACK, width=line,
     )
 
     # ── string ──
     string_top = cy + half_h
-    string_len = max(10, int(22 * scale))
-    draw.rectangle([cx, string_top, cx + 1, string_top + string_len], fill=BLACK)
+    string_len = g.string_len
+    draw.rectangle([cx, string_top, cx + line, string_top + string_len], fill=BLACK)
 
     # ── basket ──
-    bw = max(5, int(12 * scale))
-    bh = max(3, int(6 * scale))
+    bw, bh = g.basket_w, g.basket_h
     by = string_top + string_len
     draw.rectangle(
         [cx - bw // 2, by, cx + bw // 2, by + bh],
-        fill=BLACK, outline=BLACK, width=1,
+        fill=BLACK, outline=BLACK, width=line,
     )
 
 
 # ── Drawing: mn+ signature ──────────────────────────────────────────────────
 
+@instrument.timed('draw.mnplus', counts_draw=True)
 def draw_mnplus(draw, width, height, act):
     """
     Herbert Bayer–style geometric "mn+" for the finale frame.
@@ -337,6 +482,7 @@ def draw_mnplus(draw, width, height, act):
 
 # ── Drawing: geometric accents ──────────────────────────────────────────────
 
+@instrument.timed('draw.accents', counts_draw=True)
 def draw_accents(draw, width, height, hour, act):
     """
     Small Kandinsky-esque geometric markers in the sky.
@@ -353,49 +499,264 @@ def draw_accents(draw, width, height, hour, act):
         draw.rectangle([ax, ay, ax + s, ay + s], fill=color, outline=BLACK, width=1)
 
 
+# ── Frame composition ───────────────────────────────────────────────────────
+
+def draw_foreground(draw, width, height, hour, act, balloon=None):
+    """
+    Balloon, or on the finale hour a small balloon + mn+ signature.
+
+    `balloon` overrides the hour's BalloonGeometry (e.g. for sub-hour
+    animation steps).
+    """
+    # the journey table already holds the shrunken finale balloon
+    if balloon is None:
+        balloon = get_journey(width, height).balloon(hour)
+    paint_balloon(draw, balloon, act)
+    if hour == 23:
+        # finale: mn+ signature beside the arrived balloon
+        draw_mnplus(draw, width, height, act)
+
+
+def draw_frame(draw, width, height, hour, day_seed, act, balloon=None):
+    """
+    Paint every layer of a frame, back to front.
+
+    `draw` only needs a `rectangle(xy, fill, outline, width)` method, so
+    any recorder with that signature can capture the frame as well.
+    """
+    # 1 — background & datum line
+    draw_background(draw, width, height, act)
+
+    # 2 — geometric accents (behind the balloon)
+    draw_accents(draw, width, height, hour, act)
+
+    # 3 — cityscape (consistent within the day)
+    draw_cityscape(draw, width, height, day_seed, act)
+
+    # 4 — balloon (or finale)
+    draw_foreground(draw, width, height, hour, act, balloon)
+
+
+# ── Supersampling ────────────────────────────────────────────────────────────
+
+SUPERSAMPLE_FACTORS = (1, 2, 4)
+SPRITE_CACHE_SIZE = 64      # a balloon sprite is ~40 KB at 1200×300
+
+
+class _Recorder:
+    """Collects rectangle() calls instead of drawing them."""
+
+    def __init__(self):
+        self.rects = []
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self.rects.append((xy, fill, outline, width))
+
+
+@lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def balloon_sprite(hour, width, height, k):
+    """
+    The hour's balloon anti-aliased at k×, as an RGBA image to paste
+    with its own alpha; returns (sprite, (x0, y0)) or None off-canvas.
+
+    The balloon is painted on a k× grid twice, once in colour over
+    black and once as white coverage over black, and both are
+    box-filtered down by Image.reduce: that gives colour premultiplied
+    by coverage, which "RGBa" → "RGBA" turns into a plain sprite.  Since
+    the background under it is constant over each k×k cell, pasting the
+    sprite equals reducing the whole region at k× (to ±1 per channel),
+    so a frame pays one 1× paste whatever lies under the balloon.
+
+    A rect's corner (x, y) on the fine grid names the k×k cell starting
+    there, so its far edges reach x1 + k - 1, y1 + k - 1 as at 1×.
+    """
+    journey = get_journey(width, height)
+    rec = _Recorder()
+    paint_balloon(rec, journey.fine_balloon(hour, k), ACTS[journey.act(hour)], line=k)
+
+    # Bounding box in output pixels, clipped to the canvas
+    x0 = max(0, min(xy[0] for xy, *_ in rec.rects) // k)
+    y0 = max(0, min(xy[1] for xy, *_ in rec.rects) // k)
+    x1 = min(width - 1, (max(xy[2] for xy, *_ in rec.rects) + k - 1) // k)
+    y1 = min(height - 1, (max(xy[3] for xy, *_ in rec.rects) + k - 1) // k)
+    if x0 > x1 or y0 > y1:
+        return None
+
+    size = ((x1 - x0 + 1) * k, (y1 - y0 + 1) * k)
+    color = Image.new('RGB', size)
+    cover = Image.new('L', size)
+    paint, mask = ImageDraw.Draw(color), ImageDraw.Draw(cover)
+    ox, oy = x0 * k, y0 * k
+    for (rx0, ry0, rx1, ry1), fill, outline, line in rec.rects:
+        xy = [rx0 - ox, ry0 - oy, rx1 + k - 1 - ox, ry1 + k - 1 - oy]
+        paint.rectangle(xy, fill=fill, outline=outline, width=line)
+        mask.rectangle(xy, fill=255)
+    sprite = Image.merge('RGBa', (*color.reduce(k).split(), cover.reduce(k)))
+    return sprite.convert('RGBA'), (x0, y0)
+
+
+def paint_balloon_supersampled(img, hour, k):
+    """
+    Paint the hour's balloon onto a frame (background, accents and
+    skyline already drawn), anti-aliased at k×.
+    """
+    placed = balloon_sprite(hour, img.width, img.height, k)
+    if placed is not None:
+        sprite, origin = placed
+        img.paste(sprite, origin, sprite)
+
+
+# ── Static layer cache ──────────────────────────────────────────────────────
+
+LAYER_CACHE_BYTES = 32 * 1024 * 1024   # 23 base layers at 1200×300
+
+# (act_name, day_seed, width, height) → base layer, least recently used first
+_base_layers = OrderedDict()
+_base_layer_lock = threading.Lock()
+
+
+def _layer_bytes(img):
+    return img.width * img.height * 4       # Pillow keeps RGB pixels 4 bytes apart
+
+
+@instrument.timed('layer.base')           # misses only
+def _render_base_layer(act_name, day_seed, width, height):
+    act = ACTS[act_name]
+    img = Image.new('RGB', (width, height), act['bg'])
+    draw = ImageDraw.Draw(img)
+    draw_background(draw, width, height, act)
+    draw_cityscape(draw, width, height, day_seed, act)
+    return img
+
+
+def base_layer(act_name, day_seed, width, height):
+    """
+    Pre-rendered background + cityscape for one act of one day.
+
+    These are the only layers that do not depend on the hour, so every
+    frame of an act can start from a copy of the same base image.
+    Callers must copy the result before drawing on it.
+
+    Layers are evicted least recently used first to stay within
+    LAYER_CACHE_BYTES, however large the requested canvases are; a
+    layer bigger than the whole budget is rendered but not kept.
+    """
+    key = (act_name, day_seed, width, height)
+    with _base_layer_lock:
+        img = _base_layers.get(key)
+        if img is not None:
+            _base_layers.move_to_end(key)
+            return img
+
+    img = _render_base_layer(act_name, day_seed, width, height)
+    size = _layer_bytes(img)
+    if size <= LAYER_CACHE_BYTES:
+        with _base_layer_lock:
+            _base_layers[key] = img
+            total = sum(map(_layer_bytes, _base_layers.values()))
+            while total > LAYER_CACHE_BYTES:
+                _, evicted = _base_layers.popitem(last=False)
+                total -= _layer_bytes(evicted)
+    return img
+
+
+def accents_clear_of_city(height):
+    """
+    True when the sky accents can never overlap the skyline.
+
+    Accents are painted *before* the cityscape, so compositing them on
+    top of a cached base is only pixel-identical when the two cannot
+    touch.  Lowest accent edge: (height // 3 - 20) + 14; tallest
+    spire top: height - 22 - 85.
+    """
+    return height // 3 - 6 < height - 107
+
+
+def clear_layer_cache():
+    """Drop all cached base layers, skyline geometry and balloon sprites."""
+    with _base_layer_lock:
+        _base_layers.clear()
+    city_geometry.cache_clear()
+    balloon_sprite.cache_clear()
+    city_colors.cache_clear()
+
+
 # ── Frame generation ─────────────────────────────────────────────────────────
 
-def generate_triadic_frame(hour=None, day_seed=None, width=1200, height=300):
+FORMATS = ('png', 'svg')
+
+
+@instrument.timed('frame.generate')
+def generate_triadic_frame(hour=None, day_seed=None, width=1200, height=300,
+                           use_cache=True, format='png', supersample=1):
     """
     Generate a single frame of the Triadic Balloon journey.
 
     Args:
-        hour:     Current hour 0-23.  None → datetime.now().hour
-        day_seed: Seed for the cityscape.  None → day-of-year
-        width:    Image width  (default 1200)
-        height:   Image height (default 300)
+        hour:      Current hour 0-23.  None → datetime.now().hour
+        day_seed:  Seed for the cityscape.  None → day-of-year
+        width:     Image width  (default 1200)
+        height:    Image height (default 300)
+        use_cache: Start from the cached background + cityscape layer
+                   for (act, day_seed, width, height) when possible.
+        format:    'png' → raster image, 'svg' → SVG document built
+                   straight from the scene, with no pixel work.
+        supersample: 1, 2 or 4 — anti-alias the balloon by drawing it
+                   on a finer grid (png only; svg is already exact).
 
     Returns:
-        PIL.Image.Image
+        PIL.Image.Image for 'png', str for 'svg'
     """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown frame format {format!r}; expected one of {FORMATS}")
+    if supersample not in SUPERSAMPLE_FACTORS:
+        raise ValueError(f"Unsupported supersample {supersample!r}; "
+                         f"expected one of {SUPERSAMPLE_FACTORS}")
     if hour is None:
         hour = datetime.now().hour
     if day_seed is None:
         day_seed = datetime.now().timetuple().tm_yday
 
-    act_name = get_act(hour)
-    act = ACTS[act_name]
+    if format == 'svg':
+        from scene import build_scene, render_svg   # scene imports this module
+        return render_svg(build_scene(hour, day_seed, width, height))
 
-    img = Image.new('RGB', (width, height), act['bg'])
-    draw = ImageDraw.Draw(img)
+    return compose_frame(hour, day_seed, width, height, use_cache=use_cache,
+                         supersample=supersample)
 
-    # 1 — background & datum line
-    draw_background(draw, width, height, act)
 
-    # 2 — geometric accents (behind the balloon)
-    draw_accents(draw, width, height, hour, act)
+@instrument.timed('frame.compose')
+def compose_frame(hour, day_seed, width=1200, height=300, balloon=None,
+                  use_cache=True, supersample=1):
+    """
+    Rasterize one frame, optionally with an overriding BalloonGeometry.
 
-    # 3 — cityscape (consistent within the day)
-    draw_cityscape(draw, width, height, day_seed, act)
+    The hour still picks the act, accents and finale; `balloon` only
+    moves/resizes the balloon.  With `supersample` > 1 the hour's own
+    balloon is anti-aliased (an overriding `balloon` is drawn as given).
+    """
+    act_name = get_act(hour)
+    act = ACTS[act_name]
 
-    # 4 — balloon (or finale)
-    x, y, scale = get_balloon_position(hour, width, height)
-    if hour == 23:
-        # finale: small balloon at far right + mn+ signature
-        draw_balloon(draw, x, y, scale * 0.55, act)
-        draw_mnplus(draw, width, height, act)
+    if use_cache and accents_clear_of_city(height):
+        # background & cityscape from the layer cache, then the
+        # accents (sky only, never touch the skyline)
+        img = base_layer(act_name, day_seed, width, height).copy()
+        draw = ImageDraw.Draw(img)
+        draw_accents(draw, width, height, hour, act)
     else:
-        draw_balloon(draw, x, y, scale, act)
+        img = Image.new('RGB', (width, height), act['bg'])
+        draw = ImageDraw.Draw(img)
+        draw_background(draw, width, height, act)
+        draw_accents(draw, width, height, hour, act)
+        draw_cityscape(draw, width, height, day_seed, act)
+
+    if supersample > 1 and balloon is None:
+        paint_balloon_supersampled(img, hour, supersample)
+        if hour == 23:
+            draw_mnplus(draw, width, height, act)
+    else:
+        draw_foreground(draw, width, height, hour, act, balloon)
 
     return img
 
@@ -403,24 +764,36 @@ def generate_triadic_frame(hour=None, day_seed=None, width=1200, height=300):
 # ── Backward-compatible entry point ─────────────────────────────────────────
 
 def generate_image(theme='triadic', width=1200, height=300, seed=None,
-                   hour=None, day_seed=None):
+                   hour=None, day_seed=None, format='png'):
     """
     Public API.  Now delegates to the triadic frame generator.
     The `theme` and `seed` args are kept for backward compat but ignored.
     """
     return generate_triadic_frame(
         hour=hour, day_seed=day_seed, width=width, height=height,
+        format=format,
     )
 
 
+@instrument.timed('frame.save')
+def save_frame(frame, path):
+    """Write a frame from `generate_triadic_frame` (PNG image or SVG text)."""
+    if isinstance(frame, str):
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(frame)
+    else:
+        frame.save(path)
+    if instrument.ENABLED:
+        instrument.add('bytes_written', os.path.getsize(path))
+
+
 # ── CLI ──────────────────────────────────────────────────────────────────────
 
 if __name__ == '__main__':
-    import os
+    from batch_render import FrameJob, render_frames
     out = 'test_frames'
-    os.makedirs(out, exist_ok=True)
-    for h in range(24):
-        img = generate_triadic_frame(hour=h, day_seed=42)
-        img.save(f'{out}/frame_{h:02d}.png')
-        print(f'frame {h:02d}  act={get_act(h)}')
+    jobs = [FrameJob(f'{out}/frame_{h:02d}.png', h, 42, 1200, 300)
+            for h in range(24)]
+    for result in render_frames(jobs):
+        print(f'frame {result.hour:02d}  act={get_act(result.hour)}')
     print(f'\nSaved 24 frames to {out}/')
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for frame generation, encoding and the README pipeline.
+
+Times each stage (median / min over several repeats), measures its peak
+Python allocations with tracemalloc in a separate pass, and optionally
+saves the results as a JSON baseline or compares against one, exiting
+non-zero when a stage regresses beyond the threshold or breaks one of
+the relative BUDGETS.
+
+Usage:
+    python benchmark.py                       # run and print
+    python benchmark.py --save                # write bench_baseline.json
+    python benchmark.py --compare             # fail on >20% regressions
+    python benchmark.py --only frame --year   # filter stages, add 8,760-frame run
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+
+BASELINE_FILE = 'bench_baseline.json'
+DEFAULT_THRESHOLD = 0.20
+
+# (name, repeat, setup) — setup() returns the zero-arg callable to time
+STAGES = []
+
+# teardown callbacks registered by stage setups (servers, temp files)
+_cleanups = []
+
+# stage → (reference stage, max ratio of medians), checked within one run
+BUDGETS = {}
+
+
+def stage(name, repeat=20):
+    """Register a benchmark stage."""
+    def register(setup):
+        STAGES.append((name, repeat, setup))
+        return setup
+    return register
+
+
+# ── Frame generation ─────────────────────────────────────────────────────────
+
+def _frame_stage(label, hour):
+    @stage(f'frame.{label}')
+    def setup():
+        from bauhaus_generator import generate_triadic_frame, clear_layer_cache
+
+        def run():
+            clear_layer_cache()        # cold: measure the full scene
+            generate_triadic_frame(hour=hour, day_seed=42)
+        return run
+
+    @stage(f'frame.{label}.cached', repeat=200)
+    def setup_cached():
+        from bauhaus_generator import generate_triadic_frame
+
+        generate_triadic_frame(hour=hour, day_seed=42)
+        return lambda: generate_triadic_frame(hour=hour, day_seed=42)
+
+
+def _supersampled_stage(label, hour, k):
+    @stage(f'frame.{label}.ss{k}')
+    def setup():
+        from bauhaus_generator import generate_triadic_frame, clear_layer_cache
+
+        def run():
+            clear_layer_cache()
+            generate_triadic_frame(hour=hour, day_seed=42, supersample=k)
+        return run
+
+    @stage(f'frame.{label}.ss{k}.cached', repeat=200)
+    def setup_cached():
+        from bauhaus_generator import generate_triadic_frame
+
+        generate_triadic_frame(hour=hour, day_seed=42, supersample=k)
+        return lambda: generate_triadic_frame(hour=hour, day_seed=42, supersample=k)
+
+    @stage(f'frame.{label}.ss{k}.sprite', repeat=200)
+    def setup_sprite():
+        from bauhaus_generator import balloon_sprite, generate_triadic_frame
+
+        generate_triadic_frame(hour=hour, day_seed=42, supersample=k)
+
+        def run():
+            balloon_sprite.cache_clear()    # warm base layer, balloon drawn at k×
+            generate_triadic_frame(hour=hour, day_seed=42, supersample=k)
+        return run
+
+    # Anti-aliasing the published frame must stay within 2× a plain one,
+    # cold or cached; a sprite is built once per hour and size, like a
+    # base layer, so rebuilding it is held to the cold frame's cost
+    BUDGETS[f'frame.{label}.ss{k}'] = (f'frame.{label}', 2.0)
+    BUDGETS[f'frame.{label}.ss{k}.cached'] = (f'frame.{label}.cached', 2.0)
+    BUDGETS[f'frame.{label}.ss{k}.sprite'] = (f'frame.{label}', 1.0)
+
+
+for _label, _hour in (('yellow', 3), ('red', 11), ('blue', 19), ('black', 23)):
+    _frame_stage(_label, _hour)
+    _supersampled_stage(_label, _hour, 4)
+
+
+# ── Scene rasterizers ───────────────────────────────────────────────────────
+
+def _raster_stages(width, height):
+    @stage(f'scene.pil.{width}', repeat=50)
+    def setup_pil():
+        from scene import build_scene, render_pil
+        scene = build_scene(11, 42, width, height)
+        return lambda: render_pil(scene)
+
+    @stage(f'scene.numpy.{width}', repeat=50)
+    def setup_numpy():
+        from raster import render_numpy
+        from scene import build_scene
+        scene = build_scene(11, 42, width, height)
+        return lambda: render_numpy(scene)
+
+    # The NumPy backend only earns its place by beating Pillow
+    BUDGETS[f'scene.numpy.{width}'] = (f'scene.pil.{width}', 1.0)
+
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    pass
+else:
+    _raster_stages(2400, 600)
+    _raster_stages(4800, 1200)
+
+
+# ── draw_* in isolation ──────────────────────────────────────────────────────
+
+def _canvas(act):
+    from PIL import Image, ImageDraw
+    img = Image.new('RGB', (1200, 300), act['bg'])
+    return ImageDraw.Draw(img)
+
+
+@stage('draw.background', repeat=200)
+def _():
+    from bauhaus_generator import ACTS, draw_background
+    act = ACTS['red']
+    draw = _canvas(act)
+    return lambda: draw_background(draw, 1200, 300, act)
+
+
+@stage('draw.cityscape', repeat=200)
+def _():
+    from bauhaus_generator import ACTS, draw_cityscape
+    act = ACTS['red']
+    draw = _canvas(act)
+    return lambda: draw_cityscape(draw, 1200, 300, 42, act)
+
+
+@stage('draw.accents', repeat=200)
+def _():
+    from bauhaus_generator import ACTS, draw_accents
+    act = ACTS['red']
+    draw = _canvas(act)
+    return lambda: draw_accents(draw, 1200, 300, 11, act)
+
+
+@stage('draw.balloon', repeat=200)
+def _():
+    from bauhaus_generator import ACTS, draw_balloon, get_balloon_position
+    act = ACTS['red']
+    draw = _canvas(act)
+    x, y, scale = get_balloon_position(11)
+    return lambda: draw_balloon(draw, x, y, scale, act)
+
+
+@stage('draw.mnplus', repeat=200)
+def _():
+    from bauhaus_generator import ACTS, draw_mnplus
+    act = ACTS['black']
+    draw = _canvas(act)
+    return lambda: draw_mnplus(draw, 1200, 300, act)
+
+
+# ── Encoding ─────────────────────────────────────────────────────────────────
+
+def _png_stage(level):
+    @stage(f'encode.png.level{level}')
+    def setup():
+        from bauhaus_generator import generate_triadic_frame
+        img = generate_triadic_frame(hour=11, day_seed=42)
+
+        def run():
+            img.save(io.BytesIO(), format='PNG', compress_level=level)
+        return run
+
+
+for _level in (1, 6, 9):
+    _png_stage(_level)
+
+
+def _indexed_stage(preset):
+    @stage(f'encode.indexed.{preset}')
+    def setup():
+        from png_encode import encode_png, indexed_frame
+        img = indexed_frame(11, 42)
+        return lambda: encode_png(img, preset)
+
+
+for _preset in ('fast', 'default', 'small'):
+    _indexed_stage(_preset)
+
+
+# ── Batch renders ────────────────────────────────────────────────────────────
+
+def _batch(start, end, workers):
+    from batch_render import render_range
+
+    out = tempfile.mkdtemp(prefix='bench_')
+    try:
+        for _ in render_range(start, end, workers=workers, out_dir=out):
+            pass
+    finally:
+        shutil.rmtree(out, ignore_errors=True)
+
+
+@stage('batch.day', repeat=3)
+def _():
+    return lambda: _batch(date(2026, 2, 11), date(2026, 2, 11), workers=1)
+
+
+@stage('batch.year', repeat=1)
+def _():
+    workers = os.cpu_count()
+    return lambda: _batch(date(2026, 1, 1), date(2026, 12, 31), workers=workers)
+
+
+@stage('poster.4800', repeat=3)
+def _():
+    """4800×1200 banded poster, streamed to a temp PNG."""
+    from poster import render_poster
+
+    fd, path = tempfile.mkstemp(suffix='.png')
+    os.close(fd)
+    _cleanups.append(lambda: os.remove(path))
+    return lambda: render_poster(path, 11, 42, 4800, 1200, workers=1)
+
+
+@stage('responsive.variants', repeat=5)
+def _():
+    """600/1200/2400 px as PNG + WebP, plus the SVG, into an empty store."""
+    from bauhaus_generator import clear_layer_cache
+    from responsive import get_or_render_variants
+    from scene import clear_scene_cache
+
+    def run():
+        clear_layer_cache()
+        clear_scene_cache()
+        out = tempfile.mkdtemp(prefix='bench_')
+        try:
+            get_or_render_variants(11, 42, folder=out,
+                                   manifest_file=os.path.join(out, '.manifest.jsonl'))
+        finally:
+            shutil.rmtree(out, ignore_errors=True)
+    return run
+
+
+# ── README pipeline ──────────────────────────────────────────────────────────
+
+def _stats_api():
+    from fake_github import FakeGitHub, make_dataset
+
+    api = FakeGitHub(make_dataset(n_repos=150), latency=0.01).start()
+    _cleanups.append(api.stop)
+    return api
+
+
+@stage('readme.stats', repeat=3)
+def _():
+    """Repos + cold activity collection against a fake API: 150 repos, 10 ms latency."""
+    import activity
+    from github_client import GitHubClient
+
+    api = _stats_api()
+
+    def run():
+        with GitHubClient(base_url=api.url) as client:
+            client.fetch_repos()
+            aggregate, _ = activity.collect(client, 'sibalonat', activity.new_aggregate())
+        activity.format_activity(aggregate)
+    return run
+
+
+@stage('readme.stats.incremental', repeat=10)
+def _():
+    """Activity collection with a warm aggregate: stops at the first seen event."""
+    import copy
+    import activity
+    from github_client import GitHubClient
+
+    api = _stats_api()
+    with GitHubClient(base_url=api.url) as client:
+        warm, _ = activity.collect(client, 'sibalonat', activity.new_aggregate())
+
+    def run():
+        with GitHubClient(base_url=api.url) as client:
+            aggregate, _ = activity.collect(client, 'sibalonat', copy.deepcopy(warm))
+        activity.format_activity(aggregate)
+    return run
+
+
+@stage('readme.rewrite', repeat=50)
+def _():
+    import update_readme
+
+    fd, path = tempfile.mkstemp(suffix='.md')
+    os.close(fd)
+    shutil.copyfile(update_readme.readme_file, path)
+    _cleanups.append(lambda: os.remove(path))
+    activity = [f'- Pushed to sibalonat/repo-{i} (3 times) on June 0{i}, 2026'
+                for i in range(1, 5)]
+    return lambda: update_readme.update_readme(path, 'frame.png', 80, 60, activity)
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+def measure(name, repeat, setup):
+    """Time and trace one stage; returns a result dict."""
+    fn = setup()
+    fn()                                            # warm-up
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'median_ms': statistics.median(times) * 1000,
+        'min_ms': min(times) * 1000,
+        'repeat': repeat,
+        'peak_alloc_kb': peak / 1024,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return [(name, old_ms, new_ms)] for stages slower than the threshold."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get('stages', {}).get(name)
+        if not old:
+            continue
+        if result['median_ms'] > old['median_ms'] * (1 + threshold):
+            regressions.append((name, old['median_ms'], result['median_ms']))
+    return regressions
+
+
+def over_budget(results):
+    """Return [(name, reference, ratio, limit)] for stages over their budget."""
+    broken = []
+    for name, (reference, limit) in BUDGETS.items():
+        if name in results and reference in results:
+            ratio = results[name]['median_ms'] / results[reference]['median_ms']
+            if ratio > limit:
+                broken.append((name, reference, ratio, limit))
+    return broken
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Triadic Balloon pipeline.')
+    parser.add_argument('--only', action='append', default=[],
+                        help='run stages whose name starts with this prefix (repeatable)')
+    parser.add_argument('--year', action='store_true',
+                        help='include the full-year (8,760 frame) batch render')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save', action='store_true', help='write results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='fail on regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown before failing (default 0.20 = 20%%)')
+    args = parser.parse_args(argv)
+
+    results = {}
+    try:
+        for name, repeat, setup in STAGES:
+            if name == 'batch.year' and not args.year:
+                continue
+            if args.only and not any(name.startswith(p) for p in args.only):
+                continue
+            results[name] = measure(name, repeat, setup)
+            r = results[name]
+            print(f"{name:28s} {r['median_ms']:10.3f} ms  (min {r['min_ms']:.3f}, "
+                  f"n={r['repeat']})  peak {r['peak_alloc_kb']:8.1f} KB")
+    finally:
+        for cleanup in _cleanups:
+            cleanup()
+
+    status = 0
+    for name, reference, ratio, limit in over_budget(results):
+        print(f"OVER BUDGET {name}: {ratio:.2f}× {reference} (limit {limit:.1f}×)")
+        status = 1
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --save first")
+            status = 2
+        else:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            regressions = compare(results, baseline, args.threshold)
+            for name, old, new in regressions:
+                print(f"REGRESSION {name}: {old:.3f} ms → {new:.3f} ms "
+                      f"(+{(new / old - 1) * 100:.0f}%)")
+            if regressions:
+                status = 1
+            else:
+                print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'stages': results,
+            }, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.baseline}")
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
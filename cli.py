@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the Triadic Balloon tools.
+
+    python cli.py status                 # tracker state, no Pillow / requests
+    python cli.py publish [--force]      # rotate the frame if its hour changed
+    python cli.py render -o f.png --hour 11 --day 42
+    python cli.py stats                  # refresh README stats from GitHub
+    python cli.py serve [--lead 60]      # resident scheduler
+    python cli.py --import-times publish # where the startup time went
+
+Every subcommand imports what it needs inside its handler, so the
+common "frame still valid, nothing to do" tick never loads Pillow or
+requests.
+"""
+
+import argparse
+import builtins
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import instrument
+
+
+# ── Import timing ────────────────────────────────────────────────────────────
+
+class ImportTimer:
+    """
+    Self time of each top-level package imported while installed.
+
+    Wraps `builtins.__import__`; time spent in nested imports is charged
+    to the package that was actually loading.
+    """
+
+    def __init__(self):
+        self.times = defaultdict(float)
+        self._stack = []
+        self._import = builtins.__import__
+
+    def _timed(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        t0 = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - t0
+            nested = self._stack.pop()
+            self.times[name.partition('.')[0]] += elapsed - nested
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def install(self):
+        builtins.__import__ = self._timed
+        return self
+
+    def uninstall(self):
+        builtins.__import__ = self._import
+
+    def report(self, limit=12):
+        total = sum(self.times.values())
+        print(f"\nImports: {total * 1000:.1f} ms")
+        for name, seconds in sorted(self.times.items(), key=lambda kv: -kv[1])[:limit]:
+            print(f"  {name:24s} {seconds * 1000:8.1f} ms")
+
+
+# ── Subcommands ──────────────────────────────────────────────────────────────
+
+def cmd_status(args):
+    from image_tracker import (get_current_image, get_time_remaining,
+                               load_tracker, should_regenerate_images)
+
+    now = datetime.now()
+    tracker = load_tracker()
+    print(f"Current image:   {get_current_image()}")
+    print(f"Frame:           hour {tracker.get('last_hour')}, day {tracker.get('day_seed')}")
+    print(f"Regenerate now:  {should_regenerate_images(now)}")
+    print(f"Next frame:      {get_time_remaining(now)}")
+    return 0
+
+
+def cmd_publish(args):
+    import update_readme
+    from image_tracker import should_regenerate_images
+
+    now = datetime.now()
+    if not (args.force or should_regenerate_images(now)):
+        update_readme.publish_frame(now)        # reports, renders nothing
+        return 0
+
+    if args.force:
+        from image_tracker import update_tracker
+        from frame_store import prune
+        from manifest import locked, parse_policy
+
+        with locked():
+            image_name, _, keep = update_readme.render_current(
+                now.hour, now.timetuple().tm_yday, force=True)
+            update_tracker(image_name, now.hour, now.timetuple().tm_yday)
+            prune(keep=keep, policy=parse_policy(update_readme.retention))
+        print(f"Generated: {image_name}")
+    else:
+        update_readme.publish_frame(now)
+
+    if args.readme:
+        from readme_template import render_file
+
+        image = update_readme.image_markup(update_readme.select_current_image())
+        changed = render_file(update_readme.readme_file, {'image': image})
+        print(f"{update_readme.readme_file} {'updated' if changed else 'unchanged'}")
+    return 0
+
+
+def cmd_render(args):
+    from bauhaus_generator import generate_triadic_frame, save_frame
+
+    now = datetime.now()
+    hour = now.hour if args.hour is None else args.hour
+    day_seed = now.timetuple().tm_yday if args.day is None else args.day
+    frame = generate_triadic_frame(hour=hour, day_seed=day_seed, width=args.width,
+                                   height=args.height, format=args.format,
+                                   supersample=args.supersample)
+    save_frame(frame, args.output)
+    print(f"Rendered h{hour:02d} day {day_seed} {args.width}x{args.height} -> {args.output}")
+    return 0
+
+
+def cmd_stats(args):
+    import update_readme
+    from github_client import GitHubClient
+    from http_cache import HttpCache
+
+    cache = HttpCache()
+    with GitHubClient(update_readme.token, update_readme.api_url, cache=cache) as client:
+        public, private, activity = update_readme.fetch_stats(client, datetime.now())
+    cache.save()
+    update_readme.report_cache(cache)
+
+    changed = update_readme.update_readme(update_readme.readme_file,
+                                          update_readme.select_current_image(),
+                                          public, private, activity)
+    print(f"{update_readme.readme_file} {'updated' if changed else 'unchanged'}")
+    return 0
+
+
+def cmd_serve(args):
+    import scheduler
+
+    argv = ['serve', '--lead', str(args.lead), '--stats-every', str(args.stats_every)]
+    if args.no_readme:
+        argv.append('--no-readme')
+    scheduler.main(argv)
+    return 0
+
+
+# ── Entry point ──────────────────────────────────────────────────────────────
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Triadic Balloon tools.')
+    parser.add_argument('--import-times', action='store_true',
+                        help='report time spent importing each package')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    status = commands.add_parser('status', help='show the current frame and tracker state')
+    status.set_defaults(handler=cmd_status)
+
+    publish = commands.add_parser('publish', help='rotate the frame if its hour changed')
+    publish.add_argument('--force', action='store_true', help='re-render even if still valid')
+    publish.add_argument('--no-readme', dest='readme', action='store_false',
+                         help="leave README.md's image line alone")
+    publish.set_defaults(handler=cmd_publish)
+
+    render = commands.add_parser('render', help='render one frame to a file')
+    render.add_argument('-o', '--output', required=True)
+    render.add_argument('--hour', type=int, choices=range(24), metavar='0-23')
+    render.add_argument('--day', type=int, help='day-of-year seed (default: today)')
+    render.add_argument('--width', type=int, default=1200)
+    render.add_argument('--height', type=int, default=300)
+    render.add_argument('--format', choices=('png', 'svg'), default='png')
+    render.add_argument('--supersample', type=int, choices=(1, 2, 4), default=1,
+                        help='anti-alias the balloon on a 2x/4x grid')
+    render.set_defaults(handler=cmd_render)
+
+    stats = commands.add_parser('stats', help='refresh the README stats from GitHub')
+    stats.set_defaults(handler=cmd_stats)
+
+    serve = commands.add_parser('serve', help='run the resident scheduler')
+    serve.add_argument('--lead', type=float, default=60.0)
+    serve.add_argument('--no-readme', action='store_true')
+    serve.add_argument('--stats-every', type=int, default=1, metavar='HOURS')
+    serve.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    timer = ImportTimer().install() if args.import_times else None
+    t0 = time.perf_counter()
+    try:
+        with instrument.session(f'cli.{args.command}'):
+            return args.handler(args)
+    finally:
+        if timer:
+            timer.uninstall()
+            timer.report()
+            print(f"Total: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
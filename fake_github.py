@@ -0,0 +1,183 @@
+"""
+Local stand-in for the parts of the GitHub REST API that update_readme.py
+uses.  Serves a synthetic dataset over HTTP on 127.0.0.1 so the stats
+pipeline can be benchmarked and exercised without network access.
+
+    with fake_github(make_dataset(n_repos=200), latency=0.02) as api:
+        GitHubClient(base_url=api.url).fetch_repos()
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# GitHub only keeps the latest 300 events of a user's stream
+USER_EVENTS_LIMIT = 300
+
+
+# ── Dataset ──────────────────────────────────────────────────────────────────
+
+def make_dataset(n_repos=100, events_per_repo=30, owner='sibalonat',
+                 now=None, seed=0):
+    """
+    Build {'repos': [...], 'events': {full_name: [...]}} with events spread
+    over the last ~10 days, newest first (as GitHub returns them).  Event
+    ids increase with time, as GitHub's do.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    repos, events = [], {}
+    for i in range(n_repos):
+        name = f'repo-{i:04d}'
+        full_name = f'{owner}/{name}'
+        repos.append({
+            'name': name,
+            'full_name': full_name,
+            'private': rng.random() < 0.4,
+            'owner': {'login': owner},
+        })
+        stamps = sorted(
+            (now - timedelta(minutes=rng.randint(0, 10 * 24 * 60))
+             for _ in range(events_per_repo)),
+            reverse=True,
+        )
+        repo_events = []
+        for ts in stamps:
+            repo_events.append({
+                'type': rng.choice(['PushEvent'] * 4 + ['CreateEvent', 'WatchEvent']),
+                'repo': {'name': full_name},
+                'created_at': ts.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            })
+        events[full_name] = repo_events
+
+    everything = [e for repo_events in events.values() for e in repo_events]
+    everything.sort(key=lambda e: e['created_at'])
+    for i, event in enumerate(everything):
+        event['id'] = str(10 ** 9 + i)
+    return {'repos': repos, 'events': events}
+
+
+def user_events(dataset, limit=USER_EVENTS_LIMIT):
+    """The user's event stream: every repo's events, newest first, capped."""
+    everything = [e for repo_events in dataset['events'].values() for e in repo_events]
+    everything.sort(key=lambda e: int(e['id']), reverse=True)
+    return everything[:limit]
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+
+_REPO_EVENTS = re.compile(r'^/repos/([^/]+)/([^/]+)/events$')
+_USER_EVENTS = re.compile(r'^/users/([^/]+)/events$')
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):          # keep benchmark output clean
+        pass
+
+    def do_GET(self):
+        api = self.server.api
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        with api.lock:
+            api.requests += 1
+            throttled = api.throttle_every and api.requests % api.throttle_every == 0
+        if api.latency:
+            time.sleep(api.latency)
+        if throttled:
+            return self._send(429, {'message': 'slow down'}, {'Retry-After': '0'})
+
+        if url.path == '/user/repos':
+            items = api.dataset['repos']
+        elif _USER_EVENTS.match(url.path):
+            items = api.user_events
+        else:
+            match = _REPO_EVENTS.match(url.path)
+            if not match:
+                return self._send(404, {'message': 'Not Found'})
+            items = api.dataset['events'].get(f'{match.group(1)}/{match.group(2)}', [])
+        self._send_page(items, url.path, query)
+
+    def _send_page(self, items, path, query):
+        per_page = int(query.get('per_page', ['30'])[0])
+        page = int(query.get('page', ['1'])[0])
+        headers = {}
+        if page * per_page < len(items):
+            rest = {k: v[0] for k, v in query.items() if k != 'page'}
+            params = ''.join(f'{k}={v}&' for k, v in rest.items())
+            headers['Link'] = (f'<{self.server.api.url}{path}?{params}page={page + 1}>; '
+                               f'rel="next"')
+        self._send(200, items[(page - 1) * per_page:page * per_page], headers)
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        headers = dict(headers or {})
+        if status == 200:
+            etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+            headers['ETag'] = etag
+            if self.headers.get('If-None-Match') == etag:
+                with self.server.api.lock:
+                    self.server.api.not_modified += 1
+                status, data = 304, b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('X-RateLimit-Limit', '5000')
+        self.send_header('X-RateLimit-Remaining', '4999')
+        self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeGitHub:
+    """
+    A running fake API: `url` to call it, `requests` served so far and
+    how many of them were `not_modified` (304, via ETag).
+
+    Args:
+        dataset:        From make_dataset()
+        latency:        Seconds slept per request, to mimic a remote API
+        throttle_every: Answer every Nth request with 429 + Retry-After
+    """
+
+    def __init__(self, dataset, latency=0.0, throttle_every=0):
+        self.dataset = dataset
+        self.user_events = user_events(dataset)
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.requests = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.api = self
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextmanager
+def fake_github(dataset=None, **options):
+    """Run a FakeGitHub for the duration of a `with` block."""
+    api = FakeGitHub(dataset or make_dataset(), **options).start()
+    try:
+        yield api
+    finally:
+        api.stop()
@@ -6,8 +6,12 @@ Ignores the hourly check and generates the frame for the current hour.
 
 import os
 from datetime import datetime
-from bauhaus_generator import generate_triadic_frame, get_act
-from image_tracker import update_tracker, cleanup_old_images, get_current_image
+from bauhaus_generator import get_act
+from frame_store import ASSETS_FOLDER, load_index, prune
+from image_tracker import update_tracker, get_current_image
+from manifest import locked, parse_policy
+import instrument
+import update_readme
 
 now = datetime.now()
 current_hour = now.hour
@@ -23,28 +27,22 @@ if current:
 
 print(f"\nHour: {current_hour}  Act: {get_act(current_hour)}  Day seed: {day_seed}")
 
-# Generate frame
-img = generate_triadic_frame(hour=current_hour, day_seed=day_seed)
+# Hold the assets lock so a scheduled run can't interleave
+with instrument.session('force_regenerate'), locked():
+    # Generate frame as the scheduled job would (force bypasses the frame store's dedup)
+    image_name, _, keep = update_readme.render_current(current_hour, day_seed, force=True)
 
-# Save
-assets_folder = 'assets'
-os.makedirs(assets_folder, exist_ok=True)
-timestamp = now.strftime('%Y%m%d_%H%M%S')
-image_name = f'triadic_{timestamp}_h{current_hour:02d}.png'
-img.save(os.path.join(assets_folder, image_name))
-
-# Update tracker and cleanup
-update_tracker(image_name, current_hour, day_seed)
-cleanup_old_images()
+    # Update tracker and cleanup
+    update_tracker(image_name, current_hour, day_seed)
+    prune(keep=keep, policy=parse_policy(update_readme.retention))
 
 print(f"\nGenerated: {image_name}")
 
-# Show what's in assets now
-print(f"\nAssets folder:")
-for f in sorted(os.listdir(assets_folder)):
-    if f.endswith('.png'):
-        filepath = os.path.join(assets_folder, f)
-        size = os.path.getsize(filepath) / 1024
-        print(f"  {f} ({size:.1f} KB)")
+# Show what's in the store now
+print(f"\nFrame store:")
+for record in load_index().values():
+    filepath = os.path.join(ASSETS_FOLDER, record['file'])
+    size = os.path.getsize(filepath) / 1024
+    print(f"  {record['file']}  h{record['hour']:02d}  ({size:.1f} KB)")
 
 print("=" * 60)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+HTTP server for Triadic Balloon frames, rendered on demand.
+
+    python frame_server.py --port 8000
+    GET /frame.png                          # the current hour
+    GET /frame.png?hour=11&day=42&w=600&h=150
+    GET /frame.svg?hour=23
+    GET /metrics                            # Prometheus text format
+
+Encoded frames are kept in a bounded in-memory LRU keyed by the render
+inputs; with 24 × 366 default frames almost every request is a hit.
+The ETag is the frame store's content key, so a client revalidating
+gets a 304 without a render even after eviction.  The current frame
+(no hour/day given) may be cached until the next hour boundary; a frame
+with explicit hour and day never changes and is served as immutable.
+"""
+
+import argparse
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from bauhaus_generator import FORMATS, generate_triadic_frame
+from frame_store import frame_key
+from png_encode import encode_png, indexed_frame
+
+
+DEFAULT_CACHE_SIZE = 1024       # frames
+MAX_SIDE = 4096
+MIN_WIDTH = 80                  # smallest sizes the skyline layout fits in
+MIN_HEIGHT = 105
+
+CONTENT_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+
+class BadRequest(Exception):
+    """A query parameter is malformed or out of range."""
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+class FrameCache:
+    """
+    Thread-safe LRU of encoded frames with render/encode timings.
+
+    Args:
+        max_entries: Frames kept before the least recently used is evicted
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.frames = OrderedDict()
+        self.bytes = 0
+        self.counters = {'hits': 0, 'misses': 0, 'waits': 0, 'evictions': 0,
+                         'render_seconds': 0.0, 'encode_seconds': 0.0}
+        self._pending = {}              # params → Future of the render in flight
+        self._lock = threading.Lock()
+
+    def get(self, params):
+        """
+        Encoded bytes for `params` (hour, day, w, h, fmt), rendering on a miss.
+
+        Concurrent misses for the same params share one render: the first
+        renders, the rest wait on its Future (and see its exception, if any).
+        """
+        with self._lock:
+            body = self.frames.get(params)
+            if body is not None:
+                self.frames.move_to_end(params)
+                self.counters['hits'] += 1
+                return body
+            pending = self._pending.get(params)
+            if pending is None:
+                self._pending[params] = future = Future()
+            else:
+                self.counters['waits'] += 1
+        if pending is not None:
+            return pending.result()
+
+        try:
+            body = self._render(params)
+        except BaseException as e:
+            with self._lock:
+                del self._pending[params]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._pending[params]
+            self.frames[params] = body
+            self.bytes += len(body)
+            while len(self.frames) > self.max_entries:
+                _, old = self.frames.popitem(last=False)
+                self.bytes -= len(old)
+                self.counters['evictions'] += 1
+        future.set_result(body)
+        return body
+
+    def _render(self, params):
+        hour, day_seed, width, height, format = params
+        t0 = time.perf_counter()
+        if format == 'png':
+            frame = indexed_frame(hour, day_seed, width, height)
+        else:
+            frame = generate_triadic_frame(hour=hour, day_seed=day_seed,
+                                           width=width, height=height, format=format)
+        t1 = time.perf_counter()
+        if format == 'png':
+            body = encode_png(frame, preset='small').data
+        else:
+            body = frame.encode()
+        t2 = time.perf_counter()
+
+        with self._lock:
+            self.counters['misses'] += 1
+            self.counters['render_seconds'] += t1 - t0
+            self.counters['encode_seconds'] += t2 - t1
+        return body
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.counters['hits'], self.counters['misses']
+            total = hits + misses
+            return dict(self.counters, entries=len(self.frames), bytes=self.bytes,
+                        hit_ratio=hits / total if total else 0.0)
+
+
+# ── Requests ─────────────────────────────────────────────────────────────────
+
+def _int(query, name, default, low, high):
+    try:
+        value = int(query[name][0]) if name in query else default
+    except ValueError:
+        raise BadRequest(f'{name} must be an integer')
+    if not low <= value <= high:
+        raise BadRequest(f'{name} must be between {low} and {high}')
+    return value
+
+
+def parse_frame_query(path, query, now):
+    """
+    Render params and whether they follow the clock.
+
+    Returns ((hour, day_seed, width, height, format), is_current).
+    """
+    format = query.get('fmt', [path.rsplit('.', 1)[-1]])[0]
+    if format not in FORMATS:
+        raise BadRequest(f"fmt must be one of {', '.join(FORMATS)}")
+    hour = _int(query, 'hour', now.hour, 0, 23)
+    day_seed = _int(query, 'day', now.timetuple().tm_yday, 1, 366)
+    width = _int(query, 'w', 1200, MIN_WIDTH, MAX_SIDE)
+    height = _int(query, 'h', 300, MIN_HEIGHT, MAX_SIDE)
+    is_current = 'hour' not in query or 'day' not in query
+    return (hour, day_seed, width, height, format), is_current
+
+
+def render_metrics(stats, requests):
+    """Prometheus text exposition of the cache stats."""
+    lines = []
+    for name, kind, value, help_text in (
+        ('frame_requests_total', 'counter', requests, 'Frame requests served'),
+        ('frame_cache_hits_total', 'counter', stats['hits'], 'Frames served from memory'),
+        ('frame_cache_misses_total', 'counter', stats['misses'], 'Frames rendered'),
+        ('frame_cache_waits_total', 'counter', stats['waits'],
+         'Misses served by a render already in flight'),
+        ('frame_cache_evictions_total', 'counter', stats['evictions'], 'Frames evicted'),
+        ('frame_cache_entries', 'gauge', stats['entries'], 'Frames in memory'),
+        ('frame_cache_bytes', 'gauge', stats['bytes'], 'Encoded bytes in memory'),
+        ('frame_cache_hit_ratio', 'gauge', stats['hit_ratio'], 'Hits / lookups'),
+        ('frame_render_seconds_total', 'counter', stats['render_seconds'], 'Time drawing frames'),
+        ('frame_encode_seconds_total', 'counter', stats['encode_seconds'], 'Time encoding frames'),
+    ):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}']
+    return '\n'.join(lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        if not self.server.app.quiet:
+            super().log_message(*args)
+
+    def do_GET(self):
+        app = self.server.app
+        url = urlparse(self.path)
+        if url.path == '/metrics':
+            body = render_metrics(app.cache.stats(), app.requests).encode()
+            return self._send(200, body, {'Content-Type': 'text/plain; version=0.0.4'})
+        if url.path not in ('/frame.png', '/frame.svg'):
+            return self._send(404, b'not found\n', {'Content-Type': 'text/plain'})
+
+        now = app.clock()
+        try:
+            params, is_current = parse_frame_query(url.path, parse_qs(url.query), now)
+        except BadRequest as e:
+            return self._send(400, f'{e}\n'.encode(), {'Content-Type': 'text/plain'})
+        with app.lock:
+            app.requests += 1
+
+        hour, day_seed, width, height, format = params
+        headers = {
+            'Content-Type': CONTENT_TYPES[format],
+            'ETag': f'"{frame_key(hour, day_seed, width, height, format)}"',
+        }
+        if is_current:
+            expires = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            max_age = max(0, int((expires - now).total_seconds()))
+            headers['Cache-Control'] = f'public, max-age={max_age}'
+            headers['Expires'] = format_datetime(expires.astimezone(timezone.utc), usegmt=True)
+        else:
+            headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+
+        if self.headers.get('If-None-Match') == headers['ETag']:
+            return self._send(304, b'', headers)
+        try:
+            body = app.cache.get(params)
+        except Exception as e:
+            self.log_error('render failed for %s: %r', params, e)
+            return self._send(500, b'render failed\n', {'Content-Type': 'text/plain'})
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FrameServer:
+    """
+    Args:
+        host, port: Address to bind (port 0 picks a free one)
+        cache_size: Frames kept in memory
+        clock:      Returns the current local datetime
+        quiet:      Suppress per-request logging
+    """
+
+    def __init__(self, host='127.0.0.1', port=8000, cache_size=DEFAULT_CACHE_SIZE,
+                 clock=datetime.now, quiet=False):
+        self.cache = FrameCache(cache_size)
+        self.clock = clock
+        self.quiet = quiet
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.app = self
+        self.url = f'http://{host}:{self.server.server_address[1]}'
+        self._thread = None
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve Triadic Balloon frames over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help='frames kept in memory (default 1024)')
+    parser.add_argument('--quiet', action='store_true', help='no per-request log lines')
+    args = parser.parse_args(argv)
+
+    app = FrameServer(args.host, args.port, args.cache_size, quiet=args.quiet)
+    print(f"Serving frames on {app.url}/frame.png  (metrics: {app.url}/metrics)")
+    try:
+        app.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
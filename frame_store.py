@@ -0,0 +1,255 @@
+"""
+Content-addressed frame store for the Triadic Balloon.
+
+Frames are named by a hash of their render inputs and the generator
+version, so re-rendering an identical (hour, day_seed, size, format)
+is skipped entirely and never produces a second file.  The journaled
+manifest (manifest.py) maps keys to files, so lookups, pruning and
+retention never scan assets/ (apart from importing pre-store frames
+once, when the manifest is first created).
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import instrument
+from manifest import MANIFEST_FILE, Manifest, locked
+
+
+ASSETS_FOLDER = 'assets'
+LEGACY_INDEX_FILE = os.path.join(ASSETS_FOLDER, '.frame_index.json')
+
+LEGACY_NAME = re.compile(r'^triadic_(\d{8})_(\d{6})_h(\d{2})\.png$')
+
+
+# ── Keys ─────────────────────────────────────────────────────────────────────
+
+def frame_key(hour, day_seed, width=1200, height=300, format='png', supersample=1,
+              scaled=False):
+    """
+    Hash of everything that determines a frame's bytes.
+
+    `scaled` marks a frame resampled from the 1200×300 composition
+    (responsive.py) rather than laid out at its own size.
+    """
+    from bauhaus_generator import GENERATOR_VERSION
+
+    inputs = [GENERATOR_VERSION, hour, day_seed, width, height, format]
+    if supersample > 1 and format != 'svg':
+        inputs.append(supersample)          # 1× keeps its original keys
+    if scaled:
+        inputs.append('scaled')
+    payload = json.dumps(inputs, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def frame_filename(key, format='png'):
+    return f'triadic_{key}.{format}'
+
+
+# ── Index ────────────────────────────────────────────────────────────────────
+
+def open_manifest(manifest_file=MANIFEST_FILE, folder=ASSETS_FOLDER):
+    """
+    The manifest, importing a pre-manifest .frame_index.json and any
+    pre-store `triadic_<timestamp>_hHH.png` files once, so the first
+    prune cleans them up like the old scheduled cleanup did.  The
+    journal is written right after that import, even with nothing
+    adopted, so later calls never list the folder again.
+    """
+    manifest = Manifest(manifest_file)
+    if not os.path.exists(manifest_file) and os.path.isdir(folder):
+        with locked():
+            manifest.load()         # another process may have adopted meanwhile
+            if not os.path.exists(manifest_file):
+                _adopt_legacy(manifest, folder)
+                manifest.compact()  # written even when empty: adopt only once
+    legacy = os.path.join(folder, os.path.basename(LEGACY_INDEX_FILE))
+    if os.path.exists(legacy):
+        with locked(), open(legacy, 'r') as f:
+            for key, record in json.load(f).items():
+                path = os.path.join(folder, record['file'])
+                if record['file'] not in manifest.records and os.path.exists(path):
+                    manifest.add(dict(record, key=key, **_file_facts(path)))
+        os.remove(legacy)
+    return manifest
+
+
+def load_index(manifest_file=MANIFEST_FILE):
+    """The key → frame record index."""
+    return open_manifest(manifest_file).by_key()
+
+
+def lookup(key, index=None, folder=ASSETS_FOLDER):
+    """Filename stored under `key`, or None if unknown or missing on disk."""
+    index = load_index() if index is None else index
+    record = index.get(key)
+    if record and os.path.exists(os.path.join(folder, record['file'])):
+        return record['file']
+    return None
+
+
+def _file_facts(path, data=None):
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+    return {'bytes': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+
+
+# ── Store ────────────────────────────────────────────────────────────────────
+
+@instrument.timed('store.get_or_render')
+def get_or_render(hour, day_seed, width=1200, height=300, format='png',
+                  force=False, folder=ASSETS_FOLDER, manifest_file=MANIFEST_FILE,
+                  supersample=1):
+    """
+    Return the stored frame for these inputs, rendering it only if needed.
+
+    Args:
+        hour, day_seed, width, height, format: Render inputs
+        force:  Re-render and overwrite even if the key is present
+        supersample: Anti-alias the balloon at 2× or 4× (png only)
+
+    Returns:
+        (filename, rendered) — filename relative to `folder`, and whether
+        a render actually happened.
+    """
+    if format != 'png':
+        supersample = 1
+    key = frame_key(hour, day_seed, width, height, format, supersample)
+    with locked():
+        manifest = open_manifest(manifest_file, folder)
+        if not force:
+            existing = lookup(key, manifest.by_key(), folder)
+            if existing:
+                return existing, False
+
+        if format == 'png' and supersample > 1:
+            from bauhaus_generator import generate_triadic_frame
+            from png_encode import encode_png
+
+            # Anti-aliased edges: indexed only if they stay within 256 colours
+            frame = generate_triadic_frame(hour=hour, day_seed=day_seed, width=width,
+                                           height=height, supersample=supersample)
+            data = encode_png(frame, preset='small').data
+        elif format == 'png':
+            from png_encode import encode_frame
+
+            # Committed and served for days: spend the extra ms on size
+            data = encode_frame(hour, day_seed, width, height, preset='small').data
+        else:
+            from bauhaus_generator import generate_triadic_frame
+
+            data = generate_triadic_frame(hour=hour, day_seed=day_seed, width=width,
+                                          height=height, format=format).encode()
+
+        extra = {'supersample': supersample} if supersample > 1 else {}
+        filename = store(manifest, key, data, hour=hour, day_seed=day_seed, width=width,
+                         height=height, format=format, folder=folder, **extra)
+    return filename, True
+
+
+def store(manifest, key, data, hour, day_seed, width, height, format,
+          folder=ASSETS_FOLDER, **extra):
+    """
+    Write a rendered frame atomically and record it; returns its filename.
+    Callers hold the lock.
+    """
+    filename = frame_filename(key, format)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, filename)
+    with open(f'{path}.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(f'{path}.tmp', path)
+    instrument.add('frames_rendered')
+    instrument.add('bytes_written', len(data))
+
+    manifest.add({
+        'key': key,
+        'file': filename,
+        'hour': hour,
+        'day_seed': day_seed,
+        'width': width,
+        'height': height,
+        'format': format,
+        **extra,
+        **_file_facts(path, data),
+    })
+    return filename
+
+
+def prune(keep, policy=None, folder=ASSETS_FOLDER, manifest_file=MANIFEST_FILE):
+    """
+    Delete every recorded frame whose file is not kept.
+
+    Args:
+        keep:   File names that must survive (e.g. the current frame)
+        policy: Optional retention rule, e.g. manifest.parse_policy('last:24')
+
+    Only files in the manifest are touched.  Returns the removed names.
+    """
+    with locked():
+        manifest = open_manifest(manifest_file, folder)
+        keep = set(keep)
+        if policy:
+            keep |= policy(list(manifest.records.values()))
+        removed = []
+        for filename in list(manifest.records):
+            if filename in keep:
+                continue
+            path = os.path.join(folder, filename)
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                removed.append(filename)
+            except OSError as e:
+                print(f"Error removing {filename}: {e}")
+        manifest.remove(removed)
+    return removed
+
+
+def adopt_legacy(folder=ASSETS_FOLDER, manifest_file=MANIFEST_FILE):
+    """
+    Import pre-store `triadic_<timestamp>_hHH.png` files into the
+    manifest, so retention and cleanup can see them.  open_manifest does
+    this automatically when it creates the journal.  Returns the count.
+    """
+    with locked():
+        return _adopt_legacy(open_manifest(manifest_file, folder), folder)
+
+
+def _adopt_legacy(manifest, folder):
+    from datetime import datetime
+
+    adopted = 0
+    for filename in sorted(os.listdir(folder)):
+        match = LEGACY_NAME.match(filename)
+        if not match or filename in manifest.records:
+            continue
+        created = datetime.strptime(match.group(1) + match.group(2), '%Y%m%d%H%M%S')
+        manifest.add({
+            'file': filename,
+            'hour': int(match.group(3)),
+            'day_seed': created.timetuple().tm_yday,
+            'width': 1200,
+            'height': 300,
+            'format': 'png',
+            'created_at': created.isoformat(),
+            **_file_facts(os.path.join(folder, filename)),
+        })
+        adopted += 1
+    return adopted
+
+
+if __name__ == '__main__':
+    import sys
+
+    if sys.argv[1:] == ['adopt']:
+        print(f"Recorded {adopt_legacy()} legacy frames in the manifest")
+    else:
+        for record in open_manifest().newest():
+            print(f"{record['created_at']}  h{record['hour']:02d}  day {record['day_seed']:3d}  "
+                  f"{record['width']}x{record['height']}  {record['bytes']:7d} B  "
+                  f"{record['file']}")
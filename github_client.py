@@ -0,0 +1,199 @@
+"""
+Pooled, concurrent GitHub REST client for the README stats.
+
+One `requests.Session` with a connection pool sized to the worker count
+is shared by a thread pool, so per-repo event requests run in parallel
+over kept-alive connections instead of a fresh TLS handshake each.
+Rate limits are respected: 403/429 responses back off until
+`Retry-After` / `X-RateLimit-Reset`, and an exhausted quota pauses all
+workers until it resets.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import parse_header_links
+
+import instrument
+
+
+API_URL = 'https://api.github.com'
+DEFAULT_WORKERS = 8
+
+
+class GitHubError(Exception):
+    """A GitHub request failed for good (after retries)."""
+
+
+class GitHubClient:
+    """
+    Args:
+        token:       Personal access token (None → unauthenticated)
+        base_url:    API root, e.g. a local fake server for tests
+        workers:     Concurrent requests / pooled connections
+        max_retries: Attempts per request on rate limits and 5xx
+        max_wait:    Longest single back-off sleep, in seconds
+        cache:       Optional http_cache.HttpCache for conditional requests
+    """
+
+    def __init__(self, token=None, base_url=None, workers=DEFAULT_WORKERS,
+                 max_retries=5, max_wait=60.0, timeout=30.0, cache=None):
+        self.base_url = (base_url or os.getenv('GITHUB_API_URL') or API_URL).rstrip('/')
+        self.workers = workers
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept'] = 'application/vnd.github+json'
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.requests_made = 0
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Requests ─────────────────────────────────────────────────────────────
+
+    def _url(self, path):
+        return path if path.startswith('http') else f'{self.base_url}{path}'
+
+    def _wait_for_quota(self):
+        with self._lock:
+            delay = self._paused_until - time.time()
+        if delay > 0:
+            time.sleep(min(delay, self.max_wait))
+
+    def _backoff(self, response, attempt):
+        """Seconds to wait before retrying `response`, or None to give up."""
+        status = response.status_code
+        headers = response.headers
+        if status in (403, 429):
+            if 'Retry-After' in headers:
+                return float(headers['Retry-After'])
+            if headers.get('X-RateLimit-Remaining') == '0':
+                reset = float(headers.get('X-RateLimit-Reset', 0))
+                return max(0.0, reset - time.time())
+            if status == 403:
+                return None                 # a real permission error
+            return 2.0 ** attempt
+        if status >= 500:
+            return 2.0 ** attempt
+        return None
+
+    def _note_quota(self, response):
+        """Pause every worker once the rate-limit quota is exhausted."""
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset = float(response.headers.get('X-RateLimit-Reset', 0))
+            with self._lock:
+                self._paused_until = max(self._paused_until, reset)
+
+    def get(self, path, params=None, headers=None):
+        """GET with rate-limit aware retries; returns the final Response."""
+        url = self._url(path)
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_quota()
+            response = self.session.get(url, params=params, headers=headers,
+                                        timeout=self.timeout)
+            with self._lock:
+                self.requests_made += 1
+                instrument.add('http.requests')
+            self._note_quota(response)
+
+            if response.status_code < 400:
+                return response
+            delay = self._backoff(response, attempt)
+            if delay is None or attempt == self.max_retries:
+                break
+            time.sleep(min(delay, self.max_wait))
+
+        raise GitHubError(f"GET {url} failed: {response.status_code} {response.text}")
+
+    def fetch(self, path, params=None):
+        """
+        GET and decode JSON; returns (data, Link header or None).
+
+        With a cache, the request carries the stored validators and a
+        304 Not Modified is answered from the cached body.
+        """
+        if self.cache is None:
+            response = self.get(path, params)
+            return response.json(), response.headers.get('Link')
+
+        url = requests.Request('GET', self._url(path), params=params).prepare().url
+        response = self.get(url, headers=self.cache.conditional_headers(url))
+        if response.status_code == 304:
+            entry = self.cache.hit(url)
+            return entry['body'], entry.get('link')
+        body = response.json()
+        self.cache.store(url, response, body)
+        return body, response.headers.get('Link')
+
+    def get_json(self, path, params=None):
+        return self.fetch(path, params)[0]
+
+    def paginate(self, path, params=None, per_page=100):
+        """
+        Yield items from every page, following `Link: rel="next"` when the
+        server sends it and falling back to page=N+1 until a short page.
+        """
+        url = path
+        query = dict(params or {}, per_page=per_page, page=1)
+        while True:
+            items, link = self.fetch(url, query)
+            yield from items
+
+            next_link = _next_link(link)
+            if next_link:
+                url, query = next_link, None
+            elif link or query is None or len(items) < per_page:
+                return              # last page, or server paginates by Link
+            else:
+                query['page'] += 1
+
+    # ── Stats ────────────────────────────────────────────────────────────────
+
+    def fetch_repos(self):
+        """Every repository visible to the token."""
+        return list(self.paginate('/user/repos', {'visibility': 'all'}))
+
+    def fetch_repo_events(self, repo):
+        return self.get_json(f"/repos/{repo['owner']['login']}/{repo['name']}/events")
+
+    def iter_user_events(self, username):
+        """The user's own event stream, newest first, fetched page by page."""
+        return self.paginate(f'/users/{username}/events')
+
+    def fetch_events(self, repos):
+        """Events of every repo, fetched concurrently, in repo order."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            events = []
+            for repo_events in pool.map(self.fetch_repo_events, repos):
+                events.extend(repo_events)
+        return events
+
+
+def _next_link(link_header):
+    if not link_header:
+        return None
+    for link in parse_header_links(link_header):
+        if link.get('rel') == 'next':
+            return link['url']
+    return None
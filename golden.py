@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression check for the Triadic Balloon generator.
+
+Instead of keeping hundreds of reference PNGs, golden_fingerprints.json
+stores two fingerprints per frame of a fixed matrix (every hour × a few
+day seeds × a few sizes):
+
+  - sha256 of the raw RGB pixels: any change at all, and the fast path
+  - a 64-bit difference hash (dHash): how visible a change is
+
+Every rendering backend (cached and uncached composition, the scene's
+Pillow, indexed and NumPy rasterizers) is checked against the same
+fingerprints, so a new cache or backend has to reproduce the art
+exactly.  The matrix is rendered in a process pool.
+
+    python golden.py                      # check; exit 1 on any difference
+    python golden.py --backend numpy      # only some backends
+    python golden.py --tolerance 2        # accept changes within dHash distance 2
+    python golden.py --update             # re-record (after an intended change)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+
+GOLDEN_FILE = 'golden_fingerprints.json'
+
+HOURS = tuple(range(24))
+DAY_SEEDS = (1, 42, 183, 366)
+SIZES = ((1200, 300), (600, 150), (2400, 600))
+
+REFERENCE_BACKEND = 'compose'
+MAX_LISTED = 20             # failures printed before summarizing the rest
+
+
+# ── Backends ─────────────────────────────────────────────────────────────────
+
+def _compose(hour, day_seed, width, height):
+    from bauhaus_generator import generate_triadic_frame
+    return generate_triadic_frame(hour=hour, day_seed=day_seed, width=width, height=height)
+
+
+def _uncached(hour, day_seed, width, height):
+    from bauhaus_generator import generate_triadic_frame
+    return generate_triadic_frame(hour=hour, day_seed=day_seed, width=width, height=height,
+                                  use_cache=False)
+
+
+def _scene(hour, day_seed, width, height):
+    from scene import build_scene, render_pil
+    return render_pil(build_scene(hour, day_seed, width, height))
+
+
+def _indexed(hour, day_seed, width, height):
+    from scene import build_scene, render_indexed
+    return render_indexed(build_scene(hour, day_seed, width, height)).convert('RGB')
+
+
+def _numpy(hour, day_seed, width, height):
+    from raster import generate_triadic_frame_numpy
+    return generate_triadic_frame_numpy(hour, day_seed, width, height).convert('RGB')
+
+
+BACKENDS = {
+    'compose': _compose,
+    'uncached': _uncached,
+    'scene': _scene,
+    'indexed': _indexed,
+    'numpy': _numpy,
+}
+
+
+def available_backends():
+    """Backend names whose optional dependencies are installed."""
+    names = list(BACKENDS)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        names.remove('numpy')
+    return names
+
+
+# ── Fingerprints ─────────────────────────────────────────────────────────────
+
+def frame_id(hour, day_seed, width, height):
+    return f'h{hour:02d}_d{day_seed:03d}_{width}x{height}'
+
+
+def dhash(img):
+    """64-bit difference hash: brighter-than-right-neighbour bits of a 9×8 thumbnail."""
+    from PIL import Image
+
+    small = img.convert('L').resize((9, 8), Image.BOX).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (small[row * 9 + col] > small[row * 9 + col + 1])
+    return f'{bits:016x}'
+
+
+def fingerprint(img):
+    """[sha256 of the RGB pixels (128 bits), dHash] for one frame."""
+    return [hashlib.sha256(img.tobytes()).hexdigest()[:32], dhash(img)]
+
+
+def distance(hash_a, hash_b):
+    """Hamming distance between two dHashes."""
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+def _fingerprint_group(group, backends):
+    """All hours of one (day_seed, size) for each backend.  Runs in a worker."""
+    day_seed, width, height = group
+    results = []
+    for name in backends:
+        render = BACKENDS[name]
+        for hour in HOURS:
+            img = render(hour, day_seed, width, height)
+            results.append((frame_id(hour, day_seed, width, height), name,
+                            fingerprint(img)))
+    return results
+
+
+def fingerprint_matrix(backends, workers=None):
+    """Yield (frame id, backend, fingerprint) across the whole matrix."""
+    groups = [(day_seed, w, h) for (w, h) in SIZES for day_seed in DAY_SEEDS]
+    work = partial(_fingerprint_group, backends=tuple(backends))
+    if workers == 1:
+        for chunk in map(work, groups):
+            yield from chunk
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(work, groups):
+            yield from chunk
+
+
+# ── Golden file ──────────────────────────────────────────────────────────────
+
+def load_golden(path=GOLDEN_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_golden(frames, path=GOLDEN_FILE):
+    from bauhaus_generator import GENERATOR_VERSION
+
+    matrix = {'hours': list(HOURS), 'day_seeds': list(DAY_SEEDS),
+              'sizes': [list(s) for s in SIZES]}
+    # One frame per line, so a re-record diffs as exactly the frames that changed
+    entries = ',\n'.join(f'  {json.dumps(fid)}: {json.dumps(fp)}'
+                         for fid, fp in sorted(frames.items()))
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        f.write(f'{{\n "generator_version": {GENERATOR_VERSION},\n'
+                f' "matrix": {json.dumps(matrix)},\n'
+                f' "frames": {{\n{entries}\n }}\n}}\n')
+    os.replace(f'{path}.tmp', path)
+
+
+def check(golden, backends, workers=None, tolerance=None):
+    """
+    Compare every backend against the golden fingerprints.
+
+    Returns [(frame id, backend, problem)]: any pixel change, or with a
+    `tolerance` only those whose dHash distance exceeds it, and frames
+    missing from the golden file.
+    """
+    failures = []
+    for fid, backend, (sha, phash) in fingerprint_matrix(backends, workers):
+        expected = golden['frames'].get(fid)
+        if expected is None:
+            failures.append((fid, backend, 'not in the golden file'))
+        elif sha != expected[0]:
+            d = distance(phash, expected[1])
+            if tolerance is None or d > tolerance:
+                failures.append((fid, backend, f'pixels changed, dHash distance {d}'))
+    return failures
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Golden-image regression check.')
+    parser.add_argument('--update', action='store_true',
+                        help=f're-record fingerprints from the {REFERENCE_BACKEND!r} backend')
+    parser.add_argument('--backend', action='append', choices=sorted(BACKENDS),
+                        help='check only these backends (repeatable; default: all available)')
+    parser.add_argument('--tolerance', type=int, default=None, metavar='BITS',
+                        help='accept pixel changes within this dHash distance '
+                             '(default: any change fails)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--golden', default=GOLDEN_FILE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.update:
+        frames = {fid: fp for fid, _, fp in
+                  fingerprint_matrix([REFERENCE_BACKEND], args.workers)}
+        save_golden(frames, args.golden)
+        print(f"Recorded {len(frames)} fingerprints to {args.golden} "
+              f"in {time.perf_counter() - start:.1f}s")
+        return 0
+
+    from bauhaus_generator import GENERATOR_VERSION
+
+    golden = load_golden(args.golden)
+    backends = args.backend or available_backends()
+    failures = check(golden, backends, args.workers, args.tolerance)
+    elapsed = time.perf_counter() - start
+
+    for fid, backend, problem in failures[:MAX_LISTED]:
+        print(f"FAIL {fid} [{backend}]: {problem}")
+    if len(failures) > MAX_LISTED:
+        print(f"... and {len(failures) - MAX_LISTED} more")
+    total = len(golden['frames'])
+    print(f"{total} frames × {len(backends)} backends ({', '.join(backends)}) "
+          f"in {elapsed:.1f}s: {len(failures) or 'no'} failures")
+    if failures and golden['generator_version'] != GENERATOR_VERSION:
+        print(f"GENERATOR_VERSION is {GENERATOR_VERSION}, fingerprints are from "
+              f"{golden['generator_version']}: if the new art is intended, run --update")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
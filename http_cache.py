@@ -0,0 +1,139 @@
+"""
+Persistent HTTP response cache for the GitHub stats fetch.
+
+Stores the body plus ETag / Last-Modified of each GET, keyed by full URL,
+so the next run can send `If-None-Match` / `If-Modified-Since`.  GitHub
+answers unchanged resources with 304 Not Modified, which does not count
+against the rate limit, and the cached body is reused.
+
+Entries are evicted by age (`max_age`) and, least recently used first,
+by total count and body size.  Hit / miss counters show how much
+network work a run actually did.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+CACHE_FILE = 'assets/.http_cache.json'
+
+DEFAULT_MAX_AGE = 14 * 24 * 3600        # seconds
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024     # serialized bodies
+
+
+class HttpCache:
+    """
+    Args:
+        path:        JSON file the cache persists to
+        max_age:     Drop entries not refreshed for this many seconds
+        max_entries: Keep at most this many URLs
+        max_bytes:   Keep the serialized bodies under this size
+    """
+
+    def __init__(self, path=CACHE_FILE, max_age=DEFAULT_MAX_AGE,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.counters = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self.load()
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f).get('entries', {})
+            except (OSError, ValueError):
+                self.entries = {}           # a corrupt cache is just a cold cache
+
+    def save(self):
+        """Evict, then write the cache atomically."""
+        with self._lock:
+            self._evict()
+            data = {'entries': self.entries}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    # ── Lookup / store ───────────────────────────────────────────────────────
+
+    def conditional_headers(self, url):
+        """Validators to send with a GET of `url` (empty if uncached)."""
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def hit(self, url):
+        """Record a 304 for `url` and return its cached entry."""
+        with self._lock:
+            entry = self.entries[url]
+            entry['used_at'] = time.time()
+            entry['stored_at'] = entry['used_at']      # revalidated
+            self.counters['hits'] += 1
+            return entry
+
+    def store(self, url, response, body):
+        """Record a 200 for `url`; only responses with validators are kept."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self._lock:
+            self.counters['misses'] += 1
+            if not (etag or last_modified):
+                return
+            now = time.time()
+            self.entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'link': response.headers.get('Link'),
+                'body': body,
+                'stored_at': now,
+                'used_at': now,
+            }
+            self.counters['stores'] += 1
+
+    # ── Eviction ─────────────────────────────────────────────────────────────
+
+    def _evict(self):
+        now = time.time()
+        before = len(self.entries)
+        self.entries = {
+            url: e for url, e in self.entries.items()
+            if now - e['stored_at'] <= self.max_age
+        }
+
+        # least recently used first
+        ordered = sorted(self.entries.items(), key=lambda kv: kv[1]['used_at'],
+                         reverse=True)
+        kept, total = {}, 0
+        for url, entry in ordered:
+            size = len(json.dumps(entry['body'], separators=(',', ':')))
+            if len(kept) >= self.max_entries or total + size > self.max_bytes:
+                continue
+            kept[url] = entry
+            total += size
+        self.entries = kept
+        self.counters['evictions'] += before - len(kept)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.counters['hits'], self.counters['misses']
+            total = hits + misses
+            return dict(self.counters, entries=len(self.entries),
+                        hit_ratio=hits / total if total else 0.0)
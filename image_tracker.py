@@ -7,6 +7,8 @@ import json
 import os
 from datetime import datetime
 
+from manifest import locked
+
 
 TRACKER_FILE = 'assets/.image_tracker.json'
 
@@ -14,41 +16,49 @@ TRACKER_FILE = 'assets/.image_tracker.json'
 def load_tracker():
     """Load the image tracker data."""
     if os.path.exists(TRACKER_FILE):
-        with open(TRACKER_FILE, 'r') as f:
-            return json.load(f)
+        try:
+            with open(TRACKER_FILE, 'r') as f:
+                return json.load(f)
+        except ValueError:
+            pass                        # left corrupt by an older, non-atomic writer
     return {}
 
 
 def save_tracker(data):
     """Save the image tracker data."""
     os.makedirs(os.path.dirname(TRACKER_FILE), exist_ok=True)
-    with open(TRACKER_FILE, 'w') as f:
+    tmp = f'{TRACKER_FILE}.tmp'
+    with open(tmp, 'w') as f:
         json.dump(data, f, indent=2)
+    os.replace(tmp, TRACKER_FILE)       # readers never see a half-written file
 
 
-def should_regenerate_images():
+def should_regenerate_images(now=None):
     """
     Check if a new frame should be generated.
     Returns True if the current hour differs from the last generated hour,
     or if no image has been generated yet.
+
+    Pass `now` to share one clock reading with the caller.
     """
     tracker = load_tracker()
 
     if not tracker.get('last_generated'):
         return True
 
-    current_hour = datetime.now().hour
-    current_day = datetime.now().timetuple().tm_yday
+    now = now or datetime.now()
+    current_hour = now.hour
+    current_day = now.timetuple().tm_yday
     return (
         tracker.get('last_hour') != current_hour
         or tracker.get('day_seed') != current_day
     )
 
 
-def get_time_remaining():
+def get_time_remaining(now=None):
     """Return a human-readable string about the next frame change."""
     from datetime import timedelta
-    now = datetime.now()
+    now = now or datetime.now()
     next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
     remaining = next_hour - now
     minutes = int(remaining.total_seconds() // 60)
@@ -70,7 +80,8 @@ def update_tracker(filename, hour, day_seed):
         'day_seed': day_seed,
         'current_image': filename,
     }
-    save_tracker(tracker)
+    with locked():
+        save_tracker(tracker)
 
 
 def get_current_images():
@@ -90,26 +101,18 @@ def get_current_image():
     return tracker.get('current_image')
 
 
-def cleanup_old_images():
-    """Remove old images from assets/ that are not the current frame."""
-    tracker = load_tracker()
-    current = tracker.get('current_image', '')
-
-    assets_folder = 'assets'
-    if not os.path.exists(assets_folder):
-        return
-
-    for filename in os.listdir(assets_folder):
-        filepath = os.path.join(assets_folder, filename)
-        if (os.path.isfile(filepath)
-                and filename.endswith('.png')
-                and filename != current
-                and not filename.startswith('.')):
-            try:
-                os.remove(filepath)
-                print(f"Removed old frame: {filename}")
-            except Exception as e:
-                print(f"Error removing {filename}: {e}")
+def cleanup_old_images(policy=None):
+    """
+    Remove recorded frames other than the current one (and any kept by
+    `policy`, see manifest.parse_policy).  Queries the manifest; assets/
+    is not listed.
+    """
+    from frame_store import prune
+
+    with locked():
+        current = load_tracker().get('current_image')
+        for filename in prune(keep={current} if current else set(), policy=policy):
+            print(f"Removed old frame: {filename}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,120 @@
+"""
+Incremental frame updates for the Triadic Balloon.
+
+Within one act the background and cityscape never change; only the
+balloon (plus the mn+ signature on the finale) and the hour-seeded sky
+accents move.  `update_frame` turns the previous frame into the next
+one by restoring just those old footprints from the cached base layer
+and painting the new ones, and reports the dirty boxes it touched so
+delta encoders can reuse them.
+"""
+
+from functools import lru_cache
+
+from PIL import ImageDraw
+
+from bauhaus_generator import (
+    ACTS, get_act, base_layer, accents_clear_of_city,
+    compose_frame, draw_accents, draw_foreground,
+)
+from scene import DisplayList
+
+
+# ── Dirty regions ────────────────────────────────────────────────────────────
+
+def dynamic_boxes(width, height, hour, balloon=None):
+    """
+    PIL boxes (exclusive right/bottom, clipped) of everything that can
+    differ between frames of the same act: one per sky accent and one
+    around the balloon (and, on the finale, the signature).
+    """
+    if balloon is None:
+        return list(_hour_boxes(width, height, hour))
+    return _dynamic_boxes(width, height, hour, balloon)
+
+
+@lru_cache(maxsize=256)
+def _hour_boxes(width, height, hour):
+    return tuple(_dynamic_boxes(width, height, hour, None))
+
+
+def _dynamic_boxes(width, height, hour, balloon):
+    act = ACTS[get_act(hour)]
+
+    accents = DisplayList(width, height, act['bg'])
+    draw_accents(accents, width, height, hour, act)
+    boxes = [r[:4] for r in accents.rects]
+
+    fg = DisplayList(width, height, act['bg'])
+    draw_foreground(fg, width, height, hour, act, balloon)
+    boxes.append(_bbox(fg.rects))
+
+    return [b for b in (_clip(b, width, height) for b in boxes) if b]
+
+
+def _bbox(rects):
+    return (min(r[0] for r in rects), min(r[1] for r in rects),
+            max(r[2] for r in rects), max(r[3] for r in rects))
+
+
+def _clip(box, width, height):
+    """Inclusive box → PIL box clipped to the canvas, or None if empty."""
+    x0, y0, x1, y1 = box
+    box = (max(0, x0), max(0, y0), min(width, x1 + 1), min(height, y1 + 1))
+    return box if box[0] < box[2] and box[1] < box[3] else None
+
+
+def union(boxes):
+    """Smallest PIL box covering all `boxes`, or None."""
+    boxes = [b for b in boxes if b]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def can_update(prev_hour, hour, height):
+    """True when `hour` can be derived from `prev_hour` incrementally."""
+    return get_act(prev_hour) == get_act(hour) and accents_clear_of_city(height)
+
+
+# ── Update ───────────────────────────────────────────────────────────────────
+
+def update_frame(prev_img, prev_hour, hour, day_seed,
+                 prev_balloon=None, balloon=None, in_place=True):
+    """
+    Turn the frame for `prev_hour` into the frame for `hour`.
+
+    Args:
+        prev_img:      Frame previously rendered for (prev_hour, day_seed)
+        prev_hour:     Hour of `prev_img`
+        hour:          Hour to render
+        day_seed:      Cityscape seed shared by both frames
+        prev_balloon,
+        balloon:       Optional BalloonGeometry overrides (sub-hour steps)
+        in_place:      Draw on `prev_img` itself rather than a copy
+
+    Returns:
+        (image, dirty) — dirty is the list of PIL boxes that changed
+        (the whole canvas when a full render was needed).
+    """
+    width, height = prev_img.size
+    if not can_update(prev_hour, hour, height):
+        img = compose_frame(hour, day_seed, width, height, balloon=balloon)
+        return img, [(0, 0, width, height)]
+
+    img = prev_img if in_place else prev_img.copy()
+    base = base_layer(get_act(hour), day_seed, width, height)
+
+    # 1 — wipe the old accents and balloon back to background + city
+    old = dynamic_boxes(width, height, prev_hour, prev_balloon)
+    for box in old:
+        img.paste(base.crop(box), box)
+
+    # 2 — paint the new ones in the usual order
+    act = ACTS[get_act(hour)]
+    draw = ImageDraw.Draw(img)
+    draw_accents(draw, width, height, hour, act)
+    draw_foreground(draw, width, height, hour, act, balloon)
+
+    return img, old + dynamic_boxes(width, height, hour, balloon)
@@ -0,0 +1,220 @@
+"""
+Opt-in timing, counting and profiling for the generator and publish scripts.
+
+Turned on by environment variables, read once at import:
+
+    TRIADIC_METRICS=-                    JSON line per run on stderr
+    TRIADIC_METRICS=metrics.jsonl        ... appended to a file, which keeps
+                                         the newest TRIADIC_METRICS_MAX_LINES
+                                         records (default 2000, 0 = no limit)
+    TRIADIC_METRICS=triadic.prom         Prometheus text dump of the last run
+    TRIADIC_PROFILE=cprofile             also profile the run (cprofile,
+                                         tracemalloc or both, comma-separated)
+    TRIADIC_PROFILE_DIR=profiles         where .pstats / .txt files go (default .)
+
+When both are unset, `timed()` hands back the undecorated function and
+`session()` a shared null context, so leaving the hooks in costs nothing.
+
+A session collects, per stage, calls and inclusive wall time; counters
+such as rectangles drawn per stage and bytes written; then emits one
+record when it ends.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+
+
+METRICS = os.getenv('TRIADIC_METRICS', '')
+PROFILE = {p.strip() for p in os.getenv('TRIADIC_PROFILE', '').split(',') if p.strip()}
+PROFILE_DIR = os.getenv('TRIADIC_PROFILE_DIR', '.')
+MAX_LINES = int(os.getenv('TRIADIC_METRICS_MAX_LINES', '2000'))
+ENABLED = bool(METRICS or PROFILE)
+
+_NULL = nullcontext()
+
+# stage → [calls, seconds]; counter → value
+_stages = defaultdict(lambda: [0, 0.0])
+_counters = defaultdict(int)
+_depth = 0
+
+
+# ── Recording ────────────────────────────────────────────────────────────────
+
+class _CountingDraw:
+    """Forwards to an ImageDraw-like object, counting rectangles per stage."""
+
+    def __init__(self, draw, stage):
+        self._draw = draw
+        self._key = f'rects.{stage}'
+
+    def rectangle(self, *args, **kwargs):
+        _counters[self._key] += 1
+        return self._draw.rectangle(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._draw, name)
+
+
+def timed(stage, counts_draw=False):
+    """
+    Decorator recording calls and wall time of `stage`.
+
+    With `counts_draw`, the first argument is a draw target and the
+    rectangles painted through it are counted as `rects.<stage>`.
+    Returns the function unchanged when instrumentation is off.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if counts_draw and args:
+                args = (_CountingDraw(args[0], stage),) + args[1:]
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                entry = _stages[stage]
+                entry[0] += 1
+                entry[1] += time.perf_counter() - start
+        return wrapper
+    return decorate
+
+
+def add(counter, n=1):
+    """Add `n` to a counter (e.g. 'bytes_written')."""
+    if ENABLED:
+        _counters[counter] += n
+
+
+def snapshot():
+    """Current stages and counters, as plain dicts."""
+    return {
+        'stages': {name: {'calls': calls, 'seconds': round(seconds, 6)}
+                   for name, (calls, seconds) in sorted(_stages.items())},
+        'counters': dict(sorted(_counters.items())),
+    }
+
+
+def reset():
+    _stages.clear()
+    _counters.clear()
+
+
+# ── Sessions ─────────────────────────────────────────────────────────────────
+
+def session(name):
+    """
+    Context manager around one run (a publish, a scheduler tick): resets
+    the counters, optionally profiles, and emits a record at the end.
+    Nested sessions fold into the outermost one.
+    """
+    if not ENABLED or _depth:
+        return _NULL
+    return _session(name)
+
+
+@contextmanager
+def _session(name):
+    global _depth
+    _depth += 1
+    reset()
+    profiler = None
+    if 'cprofile' in PROFILE:
+        import cProfile
+        profiler = cProfile.Profile()
+    if 'tracemalloc' in PROFILE:
+        import tracemalloc
+        tracemalloc.start(10)
+
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        try:
+            if profiler:
+                profiler.disable()
+            _finish(name, start, profiler)
+        finally:
+            _depth -= 1                 # a failed emit must not leave every later session nested
+
+
+def _finish(name, start, profiler):
+    """Write the profiles and emit the session record."""
+    record = dict(run=name, at=datetime.now().isoformat(timespec='seconds'),
+                  seconds=round(time.perf_counter() - start, 6), **snapshot())
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if profiler or 'tracemalloc' in PROFILE:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+    if profiler:
+        path = os.path.join(PROFILE_DIR, f'profile_{name}_{stamp}.pstats')
+        profiler.dump_stats(path)
+        record['profile'] = path
+    if 'tracemalloc' in PROFILE:
+        import tracemalloc
+        try:
+            record['peak_alloc_bytes'] = tracemalloc.get_traced_memory()[1]
+            path = os.path.join(PROFILE_DIR, f'alloc_{name}_{stamp}.txt')
+            with open(path, 'w') as f:
+                for stat in tracemalloc.take_snapshot().statistics('lineno')[:25]:
+                    f.write(f'{stat}\n')
+            record['allocations'] = path
+        finally:
+            tracemalloc.stop()
+    if METRICS:
+        emit(record, METRICS)
+
+
+def emit(record, target):
+    """Write `record` as a JSON line ('-' → stderr) or, for *.prom, as text."""
+    if target.endswith('.prom'):
+        tmp = f'{target}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(prometheus(record))
+        os.replace(tmp, target)          # scrapers never read a partial dump
+    elif target == '-':
+        print(json.dumps(record, sort_keys=True), file=sys.stderr)
+    else:
+        with open(target, 'a') as f:
+            f.write(json.dumps(record, sort_keys=True) + '\n')
+        _trim(target, MAX_LINES)
+
+
+def _trim(path, max_lines):
+    """Keep only the newest `max_lines` records of a JSON-lines file."""
+    if max_lines <= 0:
+        return
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    if len(lines) > max_lines:
+        with open(f'{path}.tmp', 'w') as f:
+            f.writelines(lines[-max_lines:])
+        os.replace(f'{path}.tmp', path)
+
+
+def prometheus(record):
+    """Prometheus text exposition of one session record."""
+    run = record['run']
+    lines = [
+        '# TYPE triadic_run_seconds gauge',
+        f'triadic_run_seconds{{run="{run}"}} {record["seconds"]}',
+        '# TYPE triadic_stage_seconds gauge',
+    ]
+    for stage, s in record['stages'].items():
+        lines.append(f'triadic_stage_seconds{{run="{run}",stage="{stage}"}} {s["seconds"]}')
+    lines.append('# TYPE triadic_stage_calls gauge')
+    for stage, s in record['stages'].items():
+        lines.append(f'triadic_stage_calls{{run="{run}",stage="{stage}"}} {s["calls"]}')
+    lines.append('# TYPE triadic_counter gauge')
+    for counter, value in record['counters'].items():
+        lines.append(f'triadic_counter{{run="{run}",name="{counter}"}} {value}')
+    return '\n'.join(lines) + '\n'
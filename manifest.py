@@ -0,0 +1,195 @@
+"""
+Journaled manifest of every frame in assets/, plus the process lock.
+
+The manifest is an append-only JSON-lines journal: each line adds or
+removes one frame record (file, key, hour, day_seed, size, format,
+bytes, sha256, created_at).  Appends are flushed and fsynced, replay
+ignores a torn last line, and the journal is compacted (temp file +
+rename) once dead lines outnumber live ones.  Cleanup and retention
+become queries over the replayed records instead of a walk of assets/.
+
+`locked()` serializes the publish sequence (render, track, prune)
+across processes, e.g. the scheduled job and force_regenerate.py.  It
+is reentrant within a process.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:                         # Windows
+    fcntl = None
+
+
+MANIFEST_FILE = 'assets/.manifest.jsonl'
+LOCK_FILE = 'assets/.lock'
+
+
+class LockTimeout(Exception):
+    """Another process held the assets lock for too long."""
+
+
+# ── Lock ─────────────────────────────────────────────────────────────────────
+
+_lock = threading.RLock()
+_lock_depth = 0
+_lock_fd = None
+
+
+@contextmanager
+def locked(path=LOCK_FILE, timeout=60.0):
+    """Hold the exclusive assets lock (flock) for the `with` block."""
+    global _lock_depth, _lock_fd
+    with _lock:
+        if _lock_depth == 0:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl:
+                deadline = time.monotonic() + timeout
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() > deadline:
+                            os.close(fd)
+                            raise LockTimeout(f'{path} held for over {timeout:.0f}s')
+                        time.sleep(0.05)
+            _lock_fd = fd
+        _lock_depth += 1
+        try:
+            yield
+        finally:
+            _lock_depth -= 1
+            if _lock_depth == 0:
+                os.close(_lock_fd)          # closing releases the flock
+                _lock_fd = None
+
+
+# ── Manifest ─────────────────────────────────────────────────────────────────
+
+class Manifest:
+    """
+    Frame records replayed from a JSON-lines journal, keyed by file name.
+
+    Args:
+        path: Journal file (created on first write)
+    """
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        self.records = {}
+        self.lines = 0
+        self.load()
+
+    def load(self):
+        self.records, self.lines = {}, 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue                # torn write from a crashed run
+                self.lines += 1
+                op = entry.pop('op')
+                if op == 'add':
+                    self.records[entry['file']] = entry
+                elif op == 'remove':
+                    self.records.pop(entry['file'], None)
+
+    def _append(self, entries):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        data = ''.join(json.dumps(entry, sort_keys=True) + '\n' for entry in entries)
+        with open(self.path, 'ab+') as f:
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')         # don't glue onto a torn line
+            f.write(data.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        self.lines += len(entries)
+
+    def add(self, record):
+        """Record a new (or re-rendered) frame; stamps created_at if missing."""
+        record = dict(record)
+        record.setdefault('created_at', datetime.now().isoformat(timespec='seconds'))
+        self._append([dict(record, op='add')])
+        self.records[record['file']] = record
+        return record
+
+    def remove(self, files):
+        files = [f for f in files if f in self.records]
+        if files:
+            self._append([{'op': 'remove', 'file': f} for f in files])
+            for f in files:
+                del self.records[f]
+        self.maybe_compact()
+
+    def by_key(self):
+        """{frame key: record} for the frame store."""
+        return {r['key']: r for r in self.records.values() if 'key' in r}
+
+    def newest(self):
+        """Records, most recently created first."""
+        return sorted(self.records.values(), key=lambda r: r['created_at'], reverse=True)
+
+    # ── Compaction ───────────────────────────────────────────────────────────
+
+    def maybe_compact(self):
+        if self.lines > 2 * len(self.records) + 64:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal as one add per live record, atomically."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for record in sorted(self.records.values(), key=lambda r: r['created_at']):
+                f.write(json.dumps(dict(record, op='add'), sort_keys=True) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.lines = len(self.records)
+
+
+# ── Retention ────────────────────────────────────────────────────────────────
+
+def keep_last(records, n):
+    """The `n` most recently created frames."""
+    return {r['file'] for r in sorted(records, key=lambda r: r['created_at'],
+                                      reverse=True)[:n]}
+
+
+def keep_per_act(records):
+    """The newest frame of each act (yellow / red / blue / black)."""
+    from bauhaus_generator import get_act
+
+    newest = {}
+    for r in sorted(records, key=lambda r: r['created_at']):
+        newest[get_act(r['hour'])] = r['file']
+    return set(newest.values())
+
+
+def parse_policy(text):
+    """
+    Turn 'last:24', 'per-act', 'last:6,per-act' or '' into a callable
+    records → set of files to keep (the union of each rule).
+    """
+    rules = []
+    for part in filter(None, (p.strip() for p in (text or '').split(','))):
+        name, _, arg = part.partition(':')
+        if name == 'last':
+            rules.append(lambda records, n=int(arg or 1): keep_last(records, n))
+        elif name == 'per-act':
+            rules.append(keep_per_act)
+        else:
+            raise ValueError(f'unknown retention rule: {part}')
+    return lambda records: set().union(*(rule(records) for rule in rules))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+PNG encoding for Triadic Balloon frames.
+
+A frame paints a few dozen exact colours (the act palette, black
+outlines, the muted building variants), so it fits losslessly in an
+indexed "P" PNG with a palette of exactly those colours: 1 byte per
+pixel (or 4 bits for ≤ 16 colours) instead of 3, before zlib even runs.
+`indexed_frame()` draws the scene IR straight into palette indices, so
+no quantization happens at all; arbitrary RGB images go through
+`to_palette()`, which falls back to RGB when it cannot be exact.
+
+Presets trade encode time for size:
+
+    fast     compress_level=1                 bulk renders
+    default  compress_level=6                 Pillow's default
+    small    compress_level=9, optimize=True  committed / served frames
+
+    python png_encode.py --hour 11 --day 42   # bytes and time per preset
+"""
+
+import io
+import time
+from collections import namedtuple
+
+from PIL import Image
+
+import instrument
+
+
+PRESETS = {
+    'fast': {'compress_level': 1},
+    'default': {'compress_level': 6},
+    'small': {'compress_level': 9, 'optimize': True},
+}
+DEFAULT_PRESET = 'default'
+
+EncodedFrame = namedtuple('EncodedFrame', 'data mode colors seconds')
+
+
+# ── Palette ──────────────────────────────────────────────────────────────────
+
+def to_palette(img):
+    """
+    Lossless "P" copy of an RGB image, or None if that is not possible.
+
+    Median cut with one box per distinct colour; the result is accepted
+    only if every palette entry is one of the original colours, which
+    means every box held exactly one colour and no pixel moved.
+    """
+    counts = img.getcolors(256)
+    if counts is None:
+        return None
+    n = len(counts)
+    indexed = img.quantize(colors=n, method=Image.Quantize.MEDIANCUT,
+                           dither=Image.Dither.NONE)
+    flat = indexed.getpalette()[:3 * n]
+    palette = {tuple(flat[i:i + 3]) for i in range(0, len(flat), 3)}
+    if palette != {rgb for _, rgb in counts}:
+        return None
+    return indexed
+
+
+# ── Encoding ─────────────────────────────────────────────────────────────────
+
+def indexed_frame(hour, day_seed, width=1200, height=300):
+    """The frame as a "P" image with the scene's exact palette."""
+    from scene import build_scene, render_indexed
+    return render_indexed(build_scene(hour, day_seed, width, height))
+
+
+@instrument.timed('encode.png')
+def encode_png(img, preset=DEFAULT_PRESET, palette=True):
+    """
+    Encode `img` to PNG bytes.
+
+    Args:
+        img:     RGB frame, or a "P" frame from indexed_frame()
+        preset:  Key of PRESETS (compress_level / optimize)
+        palette: Try an exact indexed encoding first
+
+    Returns:
+        EncodedFrame(data, mode, colors, seconds) — mode is 'P' or 'RGB',
+        colors the palette size (0 for RGB), seconds the encode time.
+    """
+    options = dict(PRESETS[preset])
+    start = time.perf_counter()
+    if palette and img.mode == 'RGB':
+        indexed = to_palette(img)
+        if indexed is not None:
+            img = indexed
+    colors = len(img.getpalette()) // 3 if img.mode == 'P' else 0   # ≤ 16 → 4-bit
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', **options)
+    return EncodedFrame(buf.getvalue(), img.mode, colors, time.perf_counter() - start)
+
+
+def encode_frame(hour, day_seed, width=1200, height=300, preset=DEFAULT_PRESET):
+    """Render and encode one frame as an indexed PNG."""
+    return encode_png(indexed_frame(hour, day_seed, width, height), preset)
+
+
+def save_png(img, path, preset=DEFAULT_PRESET, palette=True):
+    """Encode `img` and write it to `path`; returns the EncodedFrame."""
+    encoded = encode_png(img, preset, palette)
+    write_encoded(encoded, path)
+    return encoded
+
+
+def write_encoded(encoded, path):
+    with open(path, 'wb') as f:
+        f.write(encoded.data)
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+if __name__ == '__main__':
+    import argparse
+    from bauhaus_generator import generate_triadic_frame
+
+    parser = argparse.ArgumentParser(description='Compare PNG encodings of one frame.')
+    parser.add_argument('--hour', type=int, default=11)
+    parser.add_argument('--day', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    sources = {
+        'rgb': generate_triadic_frame(hour=args.hour, day_seed=args.day),
+        'indexed': indexed_frame(args.hour, args.day),
+    }
+    print(f"{'preset':8s} {'source':8s} {'mode':4s} {'colors':>6s} {'bytes':>8s} {'ms':>8s}")
+    for preset in PRESETS:
+        for source, frame in sources.items():
+            runs = [encode_png(frame, preset, palette=False) for _ in range(args.repeat)]
+            best = min(runs, key=lambda e: e.seconds)
+            print(f"{preset:8s} {source:8s} {best.mode:4s} {best.colors:6d} "
+                  f"{len(best.data):8d} {best.seconds * 1000:8.2f}")
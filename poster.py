@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Memory-bounded poster renderer for the Triadic Balloon.
+
+The generator's drawing code works in pixels tuned for the 1200×300
+README banner (margins, ground height, balloon size), so rendering it
+directly at 24000×6000 gives the wrong composition.  Here the scene IR
+is built once at that reference size, which makes it a resolution-
+independent description, and every rect is mapped to output pixels:
+reference pixel column v covers output columns [v·W/1200, (v+1)·W/1200),
+and 1-px outlines grow with the scale.  The result matches the banner
+at any size (at integer scales it is exactly a nearest-neighbour upscale).
+
+The image is produced in horizontal bands that are drawn, filtered and
+deflated independently, possibly on several cores, then concatenated
+into one zlib stream (Adler-32s combined arithmetically) and streamed
+into the PNG file.  Peak memory is about one band per worker, whatever
+the poster size.
+
+    python poster.py poster.png --width 24000 --height 6000 --hour 11 --day 42
+"""
+
+import argparse
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+
+REF_WIDTH, REF_HEIGHT = 1200, 300
+BAND_BYTES = 4 * 1024 * 1024        # pixels (1 byte each) per band
+
+PosterResult = namedtuple('PosterResult', 'path width height bands nbytes seconds')
+
+
+# ── Scene mapping ────────────────────────────────────────────────────────────
+
+def scaled_rects(hour, day_seed, width, height):
+    """
+    The reference scene's rects in output pixels, as solid fills.
+
+    Returns (palette, bg index, [(x0, y0, x1, y1, color index), ...]) with
+    inclusive corners, in paint order.  An outlined rect becomes its fill
+    plus four edge strips one reference pixel thick.
+    """
+    from scene import build_scene
+
+    scene = build_scene(hour, day_seed, REF_WIDTH, REF_HEIGHT)
+    palette = scene.colors()
+    index = {color: i for i, color in enumerate(palette)}
+
+    def sx(v):
+        return v * width // REF_WIDTH
+
+    def sy(v):
+        return v * height // REF_HEIGHT
+
+    rects = []
+    for x0, y0, x1, y1, fill, outline, _ in scene.rects:
+        # Reference pixels x0..x1 inclusive → output [sx(x0), sx(x1 + 1) - 1]
+        ox0, oy0, ox1, oy1 = sx(x0), sy(y0), sx(x1 + 1) - 1, sy(y1 + 1) - 1
+        if fill is not None:
+            rects.append((ox0, oy0, ox1, oy1, index[fill]))
+        if outline is not None:
+            c = index[outline]
+            ix0, iy0, ix1, iy1 = sx(x0 + 1), sy(y0 + 1), sx(x1) - 1, sy(y1) - 1
+            rects.append((ox0, oy0, ox1, iy0 - 1, c))           # top
+            rects.append((ox0, iy1 + 1, ox1, oy1, c))           # bottom
+            rects.append((ox0, oy0, ix0 - 1, oy1, c))           # left
+            rects.append((ix1 + 1, oy0, ox1, oy1, c))           # right
+    rects = [r for r in rects if r[0] <= r[2] and r[1] <= r[3]]
+    return palette, index[scene.bg], rects
+
+
+# ── Bands ────────────────────────────────────────────────────────────────────
+
+def _render_band(band, hour, day_seed, width, height, level):
+    """
+    Draw output rows [y0, y1) and deflate them as a PNG scanline segment.
+
+    Returns (raw deflate bytes ending on a byte boundary, adler32, length).
+    """
+    from PIL import Image, ImageDraw
+
+    y0, y1 = band
+    palette, bg, rects = _rects(hour, day_seed, width, height)
+    img = Image.new('P', (width, y1 - y0), bg)
+    draw = ImageDraw.Draw(img)
+    for x0, ry0, x1, ry1, color in rects:
+        if ry1 >= y0 and ry0 < y1:
+            draw.rectangle([x0, ry0 - y0, x1, ry1 - y0], fill=color)
+
+    pixels = img.tobytes()
+    del img
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    out, adler, length = [], 1, 0
+    for row in range(y1 - y0):
+        line = b'\x00' + pixels[row * width:(row + 1) * width]   # filter: None
+        adler = zlib.adler32(line, adler)
+        length += len(line)
+        out.append(compressor.compress(line))
+    out.append(compressor.flush(zlib.Z_SYNC_FLUSH))
+    return b''.join(out), adler, length
+
+
+_rects_cache = {}
+
+
+def _rects(hour, day_seed, width, height):
+    """scaled_rects(), kept per worker process for its later bands."""
+    key = (hour, day_seed, width, height)
+    if key not in _rects_cache:
+        _rects_cache.clear()
+        _rects_cache[key] = scaled_rects(hour, day_seed, width, height)
+    return _rects_cache[key]
+
+
+def adler32_combine(adler1, adler2, len2):
+    """Adler-32 of A + B from adler(A), adler(B) and len(B) (as zlib's)."""
+    base = 65521
+    rem = len2 % base
+    sum1 = adler1 & 0xffff
+    sum2 = (rem * sum1) % base
+    sum1 += (adler2 & 0xffff) + base - 1
+    sum2 += ((adler1 >> 16) & 0xffff) + ((adler2 >> 16) & 0xffff) + base - rem
+    return (sum1 % base) | ((sum2 % base) << 16)
+
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+
+# ── Poster ───────────────────────────────────────────────────────────────────
+
+def render_poster(path, hour, day_seed, width=24000, height=6000, workers=None,
+                  band_height=None, level=6):
+    """
+    Render one frame at any size straight into an indexed PNG file.
+
+    Args:
+        path:        Output .png
+        hour:        Hour (0-23)
+        day_seed:    Day-of-year seed
+        width:       Output size; the aspect ratio follows the 1200×300
+        height:      reference unless both are given
+        workers:     Processes drawing bands (None → os.cpu_count(); 1 → in-process)
+        band_height: Rows per band (default: ~BAND_BYTES of pixels)
+        level:       zlib level for the bands
+
+    Returns a PosterResult.
+    """
+    start = time.perf_counter()
+    band_height = band_height or max(1, min(height, BAND_BYTES // width))
+    bands = [(y, min(y + band_height, height)) for y in range(0, height, band_height)]
+    palette, _, _ = _rects(hour, day_seed, width, height)
+
+    render = partial(_render_band, hour=hour, day_seed=day_seed,
+                     width=width, height=height, level=level)
+    workers = workers or os.cpu_count() or 1
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)))
+        f.write(_chunk(b'PLTE', bytes(c for color in palette for c in color)))
+        f.write(_chunk(b'IDAT', b'\x78\x9c'))                 # zlib header
+
+        adler = 1
+        if workers == 1 or len(bands) == 1:
+            segments = map(render, bands)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            segments = pool.map(render, bands)
+        try:
+            for data, band_adler, length in segments:
+                f.write(_chunk(b'IDAT', data))
+                adler = adler32_combine(adler, band_adler, length)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        # Empty final block, then the checksum of every scanline
+        f.write(_chunk(b'IDAT', b'\x03\x00' + struct.pack('>I', adler)))
+        f.write(_chunk(b'IEND', b''))
+
+    return PosterResult(path, width, height, len(bands), os.path.getsize(path),
+                        time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render a poster-size Triadic Balloon frame.')
+    parser.add_argument('output')
+    parser.add_argument('--hour', type=int, default=11)
+    parser.add_argument('--day', type=int, default=1, help='day-of-year seed')
+    parser.add_argument('--width', type=int, default=24000)
+    parser.add_argument('--height', type=int, help='default: width / 4')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--band-height', type=int, default=None)
+    parser.add_argument('--level', type=int, default=6, help='zlib level (default 6)')
+    args = parser.parse_args(argv)
+
+    result = render_poster(args.output, args.hour, args.day, args.width,
+                           args.height or args.width * REF_HEIGHT // REF_WIDTH,
+                           args.workers, args.band_height, args.level)
+    print(f"Rendered {result.width}x{result.height} in {result.bands} bands: "
+          f"{result.path} ({result.nbytes / 1024 / 1024:.1f} MB, {result.seconds:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
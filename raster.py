@@ -0,0 +1,115 @@
+"""
+NumPy rasterizer backend for the Triadic Balloon.
+
+Every element the generator draws is an axis-aligned rectangle with an
+optional 1-px outline, so the rows of a frame only change where some
+rectangle starts or ends.  Between two such breakpoints every row is
+identical: the scene is painted into one template row per band (a few
+hundred at most, however tall the canvas) and the frame is a single
+gather of those templates.  Each pixel is one packed RGBX word, written
+once, in the layout Pillow wraps without copying; convert to "RGB" only
+where a consumer needs it.  Output is pixel-identical to
+`scene.render_pil`.
+
+NumPy is optional: building scenes works without it, only the
+rasterizer functions need it.
+"""
+
+import sys
+
+from scene import build_scene
+
+try:
+    import numpy as np
+except ImportError:                     # pragma: no cover - optional backend
+    np = None
+
+
+# ── Rasterizer ───────────────────────────────────────────────────────────────
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("the NumPy backend needs numpy (pip install numpy)")
+
+
+def _pack(color):
+    """Pack an RGB tuple into the native-endian uint32 of its RGBX bytes."""
+    return int.from_bytes(bytes((*color, 255)), sys.byteorder)
+
+
+def rasterize(scene):
+    """
+    Rasterize a Scene into a C-contiguous (height, width) uint32 RGBX array.
+
+    Rectangles are inclusive of both corners and clipped to the canvas,
+    matching `ImageDraw.rectangle`.  Band and clip bounds are computed
+    for all rectangles at once; each rectangle is then at most a few
+    slice assignments on the band templates (an outlined one is one for
+    the outline colour plus one for the interior).
+    """
+    _require_numpy()
+    w, h = scene.width, scene.height
+    rects = scene.rects
+    box = np.array([r[:4] for r in rects], dtype=np.int64).reshape(len(rects), 4)
+    x0, y0, x1, y1 = box.T
+
+    # Every row where some rectangle's fill or outline starts or stops
+    breaks = np.unique(np.clip(np.concatenate(([0, h], y0, y0 + 1, y1, y1 + 1)), 0, h))
+
+    def band(y):
+        return np.searchsorted(breaks, np.clip(y, 0, h)).tolist()
+
+    top, inner, bottom, end = band(y0), band(y0 + 1), band(y1), band(y1 + 1)
+    left, right = np.maximum(x0, 0).tolist(), np.minimum(x1, w - 1).tolist()
+    visible = ((x0 <= w - 1) & (x1 >= 0) & (y0 <= h - 1) & (y1 >= 0) & (x0 <= x1)
+               & (y0 <= y1)).tolist()
+
+    packed = {color: _pack(color) for color in scene.colors()}
+    bands = np.empty((len(breaks) - 1, w), dtype=np.uint32)
+    bands.fill(packed[scene.bg])
+    for i, (rx0, ry0, rx1, ry1, fill, outline, *_) in enumerate(rects):
+        if not visible[i]:
+            continue
+        cx0, cx1 = left[i], right[i] + 1
+
+        if outline is None:
+            if fill is not None:
+                bands[top[i]:end[i], cx0:cx1] = packed[fill]
+            continue
+
+        line = packed[outline]
+        if fill is None:
+            # bare outline: only the four edges that survive clipping
+            if ry0 >= 0:
+                bands[top[i]:inner[i], cx0:cx1] = line
+            if ry1 < h:
+                bands[bottom[i]:end[i], cx0:cx1] = line
+            if rx0 >= 0:
+                bands[top[i]:end[i], rx0] = line
+            if rx1 < w:
+                bands[top[i]:end[i], rx1] = line
+            continue
+
+        bands[top[i]:end[i], cx0:cx1] = line
+        if rx1 - rx0 >= 2 and ry1 - ry0 >= 2:
+            ix0, ix1 = max(rx0 + 1, 0), min(rx1 - 1, w - 1)
+            if ix0 <= ix1:
+                bands[inner[i]:bottom[i], ix0:ix1 + 1] = packed[fill]
+
+    return np.repeat(bands, np.diff(breaks), axis=0)
+
+
+def render_numpy(scene):
+    """
+    Rasterize a Scene with NumPy into an "RGBX" PIL image that shares the
+    array's memory.  `.convert('RGB')` gives render_pil's image.
+    """
+    from PIL import Image
+
+    return Image.frombuffer('RGBX', (scene.width, scene.height), rasterize(scene),
+                            'raw', 'RGBX', 0, 1)
+
+
+def generate_triadic_frame_numpy(hour=None, day_seed=None, width=1200, height=300):
+    """`generate_triadic_frame` rasterized with NumPy, as an "RGBX" image."""
+    return render_numpy(build_scene(hour, day_seed, width, height))
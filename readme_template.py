@@ -0,0 +1,102 @@
+"""
+Marker-region templating for README.md.
+
+Generated sections live between HTML comments, which GitHub does not
+render:
+
+    <!-- stats:start -->
+    🌟 **Public Repos:** 80
+    <!-- stats:end -->
+
+`render()` streams the input to the output in one pass, swapping each
+named region's body for new lines and copying everything else verbatim.
+`render_file()` writes through a temp file + rename and leaves the file
+untouched (no write, no mtime change, nothing for git to commit) when
+the result is byte-identical.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+
+import instrument
+
+
+MARKER = re.compile(r'^<!--\s*([\w-]+):(start|end)\s*-->\s*$')
+
+
+class TemplateError(Exception):
+    """The template's markers are missing, unbalanced or nested."""
+
+
+def render(src, dst, regions):
+    """
+    Copy lines from `src` to `dst`, replacing the body of each region.
+
+    Args:
+        src:     Iterable of input lines (with line endings)
+        dst:     File-like object to write to
+        regions: {name: str or list of lines (without line endings)}
+
+    Returns True if any region's body changed.
+    """
+    changed = False
+    seen = set()
+    current, old_body, newline = None, [], '\n'
+
+    for line in src:
+        match = MARKER.match(line)
+        if current is None:
+            dst.write(line)
+            if match and match.group(2) == 'start' and match.group(1) in regions:
+                current, old_body = match.group(1), []
+                newline = line[len(line.rstrip('\r\n')):] or '\n'
+            continue
+
+        if not match:
+            old_body.append(line)
+            continue
+        if match.group(1) != current or match.group(2) != 'end':
+            raise TemplateError(f"region '{current}' is not closed before {line.strip()}")
+
+        body = regions[current]
+        lines = body.splitlines() if isinstance(body, str) else body
+        new_body = [f'{text}{newline}' for text in lines]
+        changed = changed or new_body != old_body
+        dst.writelines(new_body)
+        dst.write(line)
+        seen.add(current)
+        current = None
+
+    if current is not None:
+        raise TemplateError(f"region '{current}' has no end marker")
+    missing = set(regions) - seen
+    if missing:
+        raise TemplateError(f"no markers for region(s): {', '.join(sorted(missing))}")
+    return changed
+
+
+@instrument.timed('readme.render')
+def render_file(path, regions):
+    """
+    Render `path` in place; returns True if it was rewritten.
+
+    The output goes to a temp file in the same directory, renamed over
+    `path` only when something changed.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.readme_', dir=directory)
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as src, \
+                os.fdopen(fd, 'w', encoding='utf-8', newline='') as dst:
+            changed = render(src, dst, regions)
+        if changed:
+            shutil.copymode(path, tmp)
+            os.replace(tmp, path)
+            if instrument.ENABLED:
+                instrument.add('bytes_written', os.path.getsize(path))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return changed
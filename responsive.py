@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Responsive frame variants: several widths and formats from one scene.
+
+The hour's scene is laid out once at the 1200×300 reference size and
+every variant is derived from it: the reference raster itself, wider
+rasters by mapping its rects to output pixels (as poster.py does, so
+2400 px is an exact 2× upscale), narrower ones by box-filtering the
+reference down, and one resolution-independent SVG.  With supersampling,
+every raster is resampled from the anti-aliased reference frame instead.
+Each raster is shared by its PNG and WebP encodings, and the encodes run
+in parallel.
+
+Variants live in the frame store like any other frame (content-addressed,
+recorded in the manifest, pruned with it).  `write_manifest` describes
+the current set in assets/responsive.json, from which `picture_markup`
+builds the README's <picture>/srcset block.
+
+    python responsive.py --hour 11 --day 42 --widths 600,1200,2400
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from frame_store import ASSETS_FOLDER, frame_key, lookup, open_manifest, store
+from manifest import MANIFEST_FILE, locked
+from poster import REF_HEIGHT, REF_WIDTH
+
+
+WIDTHS = (600, 1200, 2400)
+FORMATS = ('png', 'webp', 'svg')
+RESPONSIVE_FILE = os.path.join(ASSETS_FOLDER, 'responsive.json')
+
+# Lossless: the art is flat colour, where lossless WebP beats lossy on size
+WEBP_OPTIONS = {'lossless': True, 'quality': 100, 'method': 4}
+
+MIME_TYPES = {'png': 'image/png', 'webp': 'image/webp', 'svg': 'image/svg+xml'}
+
+Variant = namedtuple('Variant', 'width height format file')
+
+
+def parse_widths(text):
+    """'600,1200,2400' → (600, 1200, 2400)."""
+    return tuple(sorted({int(w) for w in text.split(',') if w.strip()}))
+
+
+def height_for(width):
+    return max(1, width * REF_HEIGHT // REF_WIDTH)
+
+
+def is_scaled(width, height, format):
+    """True for rasters resampled from the reference layout."""
+    return format != 'svg' and (width, height) != (REF_WIDTH, REF_HEIGHT)
+
+
+def variant_key(hour, day_seed, width, height, format, supersample=1):
+    """Frame store key; the reference PNG and the SVG share get_or_render's keys."""
+    return frame_key(hour, day_seed, width, height, format, supersample,
+                     scaled=is_scaled(width, height, format))
+
+
+# ── Rasters ──────────────────────────────────────────────────────────────────
+
+def raster(scene, hour, day_seed, width, height, supersample=1):
+    """
+    The scene at (width, height): exact indexed image at or above the
+    reference size, box-filtered RGB below it.
+
+    With `supersample` > 1 every size is resampled from the anti-aliased
+    reference frame instead, so all variants show the same balloon.
+    """
+    from scene import render_indexed
+
+    if supersample > 1:
+        from bauhaus_generator import generate_triadic_frame
+
+        img = generate_triadic_frame(hour=hour, day_seed=day_seed, width=REF_WIDTH,
+                                     height=REF_HEIGHT, supersample=supersample)
+        if (width, height) == (REF_WIDTH, REF_HEIGHT):
+            return img
+        return _box(img, width, height)
+
+    if (width, height) == (REF_WIDTH, REF_HEIGHT):
+        return render_indexed(scene)
+
+    if width > REF_WIDTH:
+        from PIL import ImageDraw
+        from poster import scaled_rects
+
+        palette, bg, rects = scaled_rects(hour, day_seed, width, height)
+        img = Image.new('P', (width, height), bg)
+        img.putpalette([c for color in palette for c in color])
+        draw = ImageDraw.Draw(img)
+        for x0, y0, x1, y1, color in rects:
+            draw.rectangle([x0, y0, x1, y1], fill=color)
+        return img
+
+    return _box(render_indexed(scene).convert('RGB'), width, height)
+
+
+def _box(img, width, height):
+    """Area-resample the reference raster; reduce() when the size divides it."""
+    factor = REF_WIDTH // width
+    if factor and width * factor == REF_WIDTH and height * factor == REF_HEIGHT:
+        return img.reduce(factor)
+    return img.resize((width, height), Image.BOX)
+
+
+def encode(img, format):
+    """PNG (indexed when exact, 'small' preset) or lossless WebP bytes."""
+    if format == 'png':
+        from png_encode import encode_png
+        return encode_png(img, preset='small').data
+    buf = io.BytesIO()
+    img.convert('RGB').save(buf, format='WEBP', **WEBP_OPTIONS)
+    return buf.getvalue()
+
+
+# ── Pipeline ─────────────────────────────────────────────────────────────────
+
+def get_or_render_variants(hour, day_seed, widths=WIDTHS, formats=FORMATS, workers=None,
+                           folder=ASSETS_FOLDER, manifest_file=MANIFEST_FILE, supersample=1):
+    """
+    Make sure every variant of a frame is in the store; render only the
+    missing ones.
+
+    Args:
+        hour, day_seed: Frame
+        widths:  Raster widths; heights keep the 4:1 aspect
+        formats: Any of 'png', 'webp', 'svg' (one SVG serves every width)
+        workers: Encoder threads (None → executor default)
+        supersample: Anti-alias the balloon at 2× or 4× in every raster,
+                 matching get_or_render's frame for the same factor
+
+    Returns:
+        [Variant(width, height, format, file)], rasters by format then width
+    """
+    from scene import build_scene, render_svg
+
+    targets = []
+    for format in formats:
+        if format == 'svg':
+            targets.append((REF_WIDTH, REF_HEIGHT, 'svg'))
+        else:
+            targets.extend((w, height_for(w), format) for w in sorted(widths))
+
+    with locked():
+        manifest = open_manifest(manifest_file, folder)
+        index = manifest.by_key()
+        files, missing = {}, []
+        for target in targets:
+            key = variant_key(hour, day_seed, *target, supersample=supersample)
+            files[target] = lookup(key, index, folder)
+            if files[target] is None:
+                missing.append((target, key))
+
+        if missing:
+            # The one layout pass; poster.scaled_rects reuses it from build_scene's cache
+            scene = build_scene(hour, day_seed, REF_WIDTH, REF_HEIGHT)
+            rasters = {}
+            for (width, height, format), _ in missing:
+                if format != 'svg' and (width, height) not in rasters:
+                    rasters[width, height] = raster(scene, hour, day_seed, width, height,
+                                                    supersample)
+
+            def encode_one(item):
+                (width, height, format), _ = item
+                if format == 'svg':
+                    return render_svg(scene).encode()
+                return encode(rasters[width, height], format)
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for item, data in zip(missing, pool.map(encode_one, missing)):
+                    (width, height, format), key = item
+                    extra = {'scaled': True} if is_scaled(width, height, format) else {}
+                    if supersample > 1 and format != 'svg':
+                        extra['supersample'] = supersample
+                    files[width, height, format] = store(
+                        manifest, key, data, hour=hour, day_seed=day_seed, width=width,
+                        height=height, format=format, folder=folder, **extra)
+
+    return [Variant(w, h, format, files[w, h, format]) for w, h, format in targets]
+
+
+# ── Manifest and markup ──────────────────────────────────────────────────────
+
+def write_manifest(variants, fallback, hour, day_seed, path=RESPONSIVE_FILE):
+    """
+    Describe the current variants for templating; returns the document.
+
+    `fallback` is the image plain <img> clients get (the published frame).
+    """
+    sources = {}
+    for v in variants:
+        if v.format != 'svg':
+            sources.setdefault(v.format, []).append(
+                {'width': v.width, 'height': v.height, 'file': v.file})
+    svg = next((v.file for v in variants if v.format == 'svg'), None)
+    doc = {'hour': hour, 'day_seed': day_seed, 'fallback': fallback,
+           'width': REF_WIDTH, 'height': REF_HEIGHT, 'svg': svg, 'sources': sources}
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(f'{path}.tmp', path)
+    return doc
+
+
+def load_manifest(path=RESPONSIVE_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def picture_markup(doc, folder=ASSETS_FOLDER, alt='Triadic Balloon'):
+    """
+    <picture> lines for a responsive manifest: WebP first, then PNG
+    srcsets, with the published frame as the <img> fallback.  The SVG
+    is left out, since every browser would pick it over the rasters.
+    """
+    lines = ['<picture>']
+    for format in ('webp', 'png'):
+        entries = doc['sources'].get(format)
+        if entries:
+            srcset = ', '.join(f"{folder}/{e['file']} {e['width']}w" for e in entries)
+            lines.append(f'  <source type="{MIME_TYPES[format]}" srcset="{srcset}">')
+    lines.append(f'  <img src="{folder}/{doc["fallback"]}" width="{doc["width"]}" alt="{alt}">')
+    lines.append('</picture>')
+    return lines
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    from datetime import datetime
+
+    now = datetime.now()
+    parser = argparse.ArgumentParser(description='Render responsive frame variants.')
+    parser.add_argument('--hour', type=int, default=now.hour)
+    parser.add_argument('--day', type=int, default=now.timetuple().tm_yday,
+                        help='day-of-year seed (default: today)')
+    parser.add_argument('--widths', default=','.join(map(str, WIDTHS)))
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--supersample', type=int, choices=(1, 2, 4), default=1,
+                        help='anti-alias the balloon in every raster')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    variants = get_or_render_variants(args.hour, args.day, parse_widths(args.widths),
+                                      tuple(args.formats.split(',')), args.workers,
+                                      supersample=args.supersample)
+    elapsed = time.perf_counter() - start
+    for v in variants:
+        size = os.path.getsize(os.path.join(ASSETS_FOLDER, v.file))
+        print(f"  {v.format:5s} {v.width:5d}x{v.height:<5d} {size / 1024:8.1f} KB  {v.file}")
+    print(f"{len(variants)} variants in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+Scene intermediate representation for the Triadic Balloon.
+
+`build_scene` turns (hour, day_seed, width, height) into an immutable
+tuple of rectangle primitives, each tagged with the layer it belongs to:
+
+    background → accents → city → balloon → signature
+
+Backends consume the scene instead of re-running the random draws, so a
+frame can be inspected, diffed, hashed, memoized or rendered to several
+targets from the same geometry.  Hour-independent layers are cached on
+their own and shared by every scene of the same act and day.
+"""
+
+import hashlib
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+import instrument
+from bauhaus_generator import (
+    ACTS, get_act,
+    draw_background, draw_accents, draw_cityscape, draw_mnplus,
+    get_journey, paint_balloon,
+)
+
+
+LAYERS = ('background', 'accents', 'city', 'balloon', 'signature')
+
+SCENE_CACHE_SIZE = 256
+
+
+# ── Primitives ───────────────────────────────────────────────────────────────
+
+Rect = namedtuple('Rect', 'x0 y0 x1 y1 fill outline layer')
+Rect.__doc__ = """
+Axis-aligned rectangle, inclusive of both corners (ImageDraw semantics).
+`fill` / `outline` are RGB tuples or None; outlines are always 1 px.
+"""
+
+
+class Scene(namedtuple('Scene', 'width height bg rects')):
+    """
+    An immutable, hashable frame description.
+
+    Attributes:
+        width, height: Canvas size
+        bg:            Canvas colour before any rectangle is painted
+        rects:         Tuple of Rect in painting order
+    """
+
+    __slots__ = ()
+
+    def layer(self, name):
+        """All rectangles of one layer, in painting order."""
+        return tuple(r for r in self.rects if r.layer == name)
+
+    def bbox(self, layer=None):
+        """Inclusive (x0, y0, x1, y1) around a layer (or everything), or None."""
+        rects = self.rects if layer is None else self.layer(layer)
+        if not rects:
+            return None
+        return (min(r.x0 for r in rects), min(r.y0 for r in rects),
+                max(r.x1 for r in rects), max(r.y1 for r in rects))
+
+    def colors(self):
+        """Every distinct colour the scene paints, in first-use order."""
+        seen = {self.bg: None}
+        for r in self.rects:
+            if r.fill is not None:
+                seen.setdefault(r.fill, None)
+            if r.outline is not None:
+                seen.setdefault(r.outline, None)
+        return tuple(seen)
+
+    def digest(self):
+        """Stable hex digest of the geometry, valid across processes."""
+        return hashlib.sha1(repr(tuple(self)).encode()).hexdigest()
+
+
+# ── Recording ────────────────────────────────────────────────────────────────
+
+class DisplayList:
+    """
+    Records rectangles instead of painting them.
+
+    Duck-types the one `ImageDraw` method the generator uses, so any
+    `draw_*` function can be pointed at it unchanged.
+    """
+
+    def __init__(self, width, height, bg):
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self.rects = []                 # (x0, y0, x1, y1, fill, outline)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        x0, y0, x1, y1 = xy
+        self.rects.append((x0, y0, x1, y1, fill, outline))
+
+    def __len__(self):
+        return len(self.rects)
+
+    def tagged(self, layer):
+        """The recorded rectangles as a tuple of Rect in `layer`."""
+        return tuple(Rect(*r, layer) for r in self.rects)
+
+
+def _record(layer, draw_fn, *args):
+    dl = DisplayList(0, 0, None)
+    draw_fn(dl, *args)
+    return dl.tagged(layer)
+
+
+# ── Shared layers ────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=64)
+def _background_layer(act_name, width, height):
+    return _record('background', draw_background, width, height, ACTS[act_name])
+
+
+@lru_cache(maxsize=64)
+def _city_layer(act_name, day_seed, width, height):
+    return _record('city', draw_cityscape, width, height, day_seed, ACTS[act_name])
+
+
+@lru_cache(maxsize=128)
+def _accent_layer(hour, width, height):
+    act = ACTS[get_act(hour)]
+    return _record('accents', draw_accents, width, height, hour, act)
+
+
+@lru_cache(maxsize=128)
+def _foreground_layers(hour, width, height):
+    act = ACTS[get_act(hour)]
+    balloon = _record('balloon', paint_balloon,
+                      get_journey(width, height).balloon(hour), act)
+    if hour == 23:
+        return balloon + _record('signature', draw_mnplus, width, height, act)
+    return balloon
+
+
+# ── Scene builder ────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=SCENE_CACHE_SIZE)
+@instrument.timed('scene.build')          # misses only
+def _build_scene(hour, day_seed, width, height):
+    act_name = get_act(hour)
+    rects = (
+        _background_layer(act_name, width, height)
+        + _accent_layer(hour, width, height)
+        + _city_layer(act_name, day_seed, width, height)
+        + _foreground_layers(hour, width, height)
+    )
+    return Scene(width, height, ACTS[act_name]['bg'], rects)
+
+
+def build_scene(hour=None, day_seed=None, width=1200, height=300):
+    """
+    Describe one frame of the journey as a Scene.
+
+    Args:
+        hour:     Current hour 0-23.  None → datetime.now().hour
+        day_seed: Seed for the cityscape.  None → day-of-year
+        width:    Canvas width  (default 1200)
+        height:   Canvas height (default 300)
+    """
+    if hour is None:
+        hour = datetime.now().hour
+    if day_seed is None:
+        day_seed = datetime.now().timetuple().tm_yday
+    return _build_scene(hour, day_seed, width, height)
+
+
+def clear_scene_cache():
+    """Drop every memoized scene and shared layer."""
+    for fn in (_build_scene, _background_layer, _city_layer,
+               _accent_layer, _foreground_layers):
+        fn.cache_clear()
+
+
+# ── Backends ─────────────────────────────────────────────────────────────────
+
+def render_pil(scene):
+    """Rasterize a Scene with Pillow."""
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGB', (scene.width, scene.height), scene.bg)
+    draw = ImageDraw.Draw(img)
+    for x0, y0, x1, y1, fill, outline, _ in scene.rects:
+        draw.rectangle([x0, y0, x1, y1], fill=fill, outline=outline, width=1)
+    return img
+
+
+@instrument.timed('scene.rasterize')
+def render_indexed(scene):
+    """
+    Rasterize a Scene straight into a "P" image whose palette is exactly
+    `scene.colors()`; pixel-identical to render_pil once converted.
+    """
+    from PIL import Image, ImageDraw
+
+    colors = scene.colors()
+    index = {color: i for i, color in enumerate(colors)}
+    img = Image.new('P', (scene.width, scene.height), 0)
+    img.putpalette([c for color in colors for c in color])
+    draw = ImageDraw.Draw(img)
+    for x0, y0, x1, y1, fill, outline, _ in scene.rects:
+        draw.rectangle([x0, y0, x1, y1],
+                       fill=None if fill is None else index[fill],
+                       outline=None if outline is None else index[outline], width=1)
+    return img
+
+
+def render_raw(scene):
+    """Rasterize a Scene to raw RGB bytes (row-major, 3 bytes per pixel)."""
+    return render_pil(scene).tobytes()
+
+
+# ── SVG backend ──────────────────────────────────────────────────────────────
+
+def _hex(color):
+    return '#%02x%02x%02x' % color
+
+
+def _num(v):
+    """Shortest exact text for an integer or half-integer coordinate."""
+    return str(int(v)) if v == int(v) else str(v)
+
+
+@instrument.timed('scene.svg')
+def render_svg(scene):
+    """
+    Serialize a Scene as a compact SVG document (str).
+
+    Each distinct colour becomes one shared style class (`f<n>` for
+    fills, `s<n>` for 1-px strokes), numbered in first-use order, so the
+    output is byte-deterministic for a given scene.  Outlined rectangles
+    are inset by half a pixel so the stroke lands on exactly the pixels
+    Pillow would outline.
+    """
+    classes = {color: i for i, color in enumerate(scene.colors())}
+    fills, strokes = {scene.bg}, set()
+    body = []
+    for x0, y0, x1, y1, fill, outline, _ in scene.rects:
+        if outline is None:
+            if fill is None:
+                continue
+            fills.add(fill)
+            body.append(
+                f'<rect x="{x0}" y="{y0}" width="{x1 - x0 + 1}" '
+                f'height="{y1 - y0 + 1}" class="f{classes[fill]}"/>'
+            )
+            continue
+        strokes.add(outline)
+        cls = f's{classes[outline]}'
+        if fill is not None:
+            fills.add(fill)
+            cls = f'f{classes[fill]} {cls}'
+        body.append(
+            f'<rect x="{_num(x0 + 0.5)}" y="{_num(y0 + 0.5)}" '
+            f'width="{x1 - x0}" height="{y1 - y0}" class="{cls}"/>'
+        )
+
+    style = [f'.f{i}{{fill:{_hex(c)}}}' for c, i in classes.items() if c in fills]
+    style += [f'.s{i}{{stroke:{_hex(c)}}}' for c, i in classes.items() if c in strokes]
+    w, h = scene.width, scene.height
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" '
+        f'viewBox="0 0 {w} {h}" shape-rendering="crispEdges">'
+        f'<style>{"".join(style)}</style>'
+        f'<rect width="{w}" height="{h}" class="f{classes[scene.bg]}"/>'
+        + ''.join(body)
+        + '</svg>\n'
+    )
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Resident scheduler for the Triadic Balloon frame and README.
+
+    python -m scheduler serve              # run until interrupted
+    python -m scheduler serve --lead 120   # pre-render two minutes early
+
+One long-lived process keeps Pillow imported, the base-layer caches warm
+and the GitHub session plus HTTP cache open, instead of paying a cold
+start every hour.  Shortly before each hour boundary it renders the next
+frame into the frame store and refreshes the stats; at the boundary it
+only repoints the tracker and rewrites the README, both temp file +
+rename.  Committing the result stays the job of the workflow.
+"""
+
+import argparse
+import signal
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import requests
+
+import instrument
+import update_readme
+from bauhaus_generator import get_act
+from frame_store import prune
+from github_client import GitHubClient, GitHubError
+from http_cache import HttpCache
+from image_tracker import update_tracker
+from manifest import locked, parse_policy
+
+
+DEFAULT_LEAD = 60.0         # seconds before the hour to pre-render
+MAX_NAP = 300.0             # re-read the clock at least this often while sleeping
+
+# A rendered frame waiting for its hour to start
+Pending = namedtuple('Pending', 'when filename hour day_seed rendered')
+
+
+def next_boundary(now):
+    """Start of the hour after `now`."""
+    return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+
+class Scheduler:
+    """
+    Args:
+        lead:        Seconds before each hour to pre-render its frame
+        readme:      Also keep README.md's regions (image, stats, activity) current
+        stats_every: Refresh the GitHub stats every N hours
+        clock:       Returns the current local datetime
+    """
+
+    def __init__(self, lead=DEFAULT_LEAD, readme=True, stats_every=1,
+                 clock=datetime.now):
+        self.lead = lead
+        self.readme = readme
+        self.stats_every = max(1, stats_every)
+        self.clock = clock
+        self.stats = None
+        self.stats_age = 0
+        self.published = None
+        self._stop = threading.Event()
+        self._cache = None
+        self._client = None
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        if self._client:
+            self._client.close()
+            self._cache.save()
+            self._client = self._cache = None
+
+    def sleep_until(self, when):
+        """Sleep until `when` (local time); False if stopped first."""
+        while not self._stop.is_set():
+            remaining = (when - self.clock()).total_seconds()
+            if remaining <= 0:
+                return True
+            self._stop.wait(min(remaining, MAX_NAP))
+        return False
+
+    # ── Work ─────────────────────────────────────────────────────────────────
+
+    def refresh_stats(self, when):
+        """Update cached stats through the warm session; keeps the old ones on error."""
+        if self._client is None:
+            self._cache = HttpCache()
+            self._client = GitHubClient(update_readme.token, update_readme.api_url,
+                                        cache=self._cache)
+        try:
+            self.stats = update_readme.fetch_stats(self._client, when)
+        except (GitHubError, requests.RequestException) as e:
+            print(f"Stats refresh failed, keeping previous values: {e}")
+            return
+        self._cache.save()
+        self.stats_age = 0
+
+    def prepare(self, when):
+        """Render the frame for `when` into the store; nothing is published yet."""
+        hour, day_seed = when.hour, when.timetuple().tm_yday
+        with instrument.session('scheduler.prepare'):
+            filename, rendered, _ = update_readme.render_current(hour, day_seed)
+            if self.readme and (self.stats is None or self.stats_age >= self.stats_every):
+                self.refresh_stats(when)
+        return Pending(when, filename, hour, day_seed, rendered)
+
+    def publish(self, pending):
+        """Make a prepared frame current: tracker, README, then old frames."""
+        with instrument.session('scheduler.publish'), locked():
+            # A lookup normally; re-renders if another run pruned it meanwhile
+            filename, _, keep = update_readme.render_current(pending.hour, pending.day_seed)
+            update_tracker(filename, pending.hour, pending.day_seed)
+            if self.readme and self.stats:
+                update_readme.update_readme(update_readme.readme_file, filename,
+                                            *self.stats)
+            prune(keep=keep, policy=parse_policy(update_readme.retention))
+        self.published = filename
+        self.stats_age += 1
+
+    def run(self):
+        """Publish the current hour, then every following hour until stopped."""
+        now = self.clock()
+        self.publish(self.prepare(now))
+        print(f"Serving h{now.hour:02d} ({get_act(now.hour)}): {self.published}")
+
+        while not self._stop.is_set():
+            boundary = next_boundary(self.clock())
+            if not self.sleep_until(boundary - timedelta(seconds=self.lead)):
+                break
+            t0 = time.perf_counter()
+            pending = self.prepare(boundary)
+            prepared_in = time.perf_counter() - t0
+
+            if not self.sleep_until(boundary):
+                break
+            t0 = time.perf_counter()
+            self.publish(pending)
+            print(f"Published h{pending.hour:02d} ({get_act(pending.hour)}): "
+                  f"{pending.filename}  prepared in {prepared_in * 1000:.0f} ms, "
+                  f"swapped in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Triadic Balloon scheduler.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='keep the frame and README current')
+    serve.add_argument('--lead', type=float, default=DEFAULT_LEAD,
+                       help='seconds before the hour to pre-render (default 60)')
+    serve.add_argument('--no-readme', action='store_true',
+                       help='only rotate frames, leave README.md alone')
+    serve.add_argument('--stats-every', type=int, default=1, metavar='HOURS',
+                       help='refresh GitHub stats every N hours (default 1)')
+    args = parser.parse_args(argv)
+
+    scheduler = Scheduler(lead=args.lead, readme=not args.no_readme,
+                          stats_every=args.stats_every)
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.close()
+
+
+if __name__ == '__main__':
+    main()
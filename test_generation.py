@@ -5,23 +5,32 @@ Saves them to test_frames/ so you can preview the full daily cycle.
 """
 
 import os
-from bauhaus_generator import generate_triadic_frame, get_act
+from bauhaus_generator import get_act
+from batch_render import FrameJob, render_frames
 
-test_dir = 'test_frames'
-os.makedirs(test_dir, exist_ok=True)
 
-day_seed = 42  # fixed seed for consistent cityscape
+def main():
+    test_dir = 'test_frames'
+    os.makedirs(test_dir, exist_ok=True)
 
-print("Generating all 24 Triadic Balloon frames...")
-print("=" * 55)
+    day_seed = 42  # fixed seed for consistent cityscape
 
-for hour in range(24):
-    act = get_act(hour)
-    img = generate_triadic_frame(hour=hour, day_seed=day_seed)
-    filename = f'{test_dir}/frame_{hour:02d}_{act}.png'
-    img.save(filename)
-    print(f"  h{hour:02d}  act={act:6s}  -> {filename}")
+    print("Generating all 24 Triadic Balloon frames...")
+    print("=" * 55)
 
-print("=" * 55)
-print(f"Done! 24 frames saved to '{test_dir}/'")
-print("\nActs:  Yellow (0-7)  Red (8-15)  Blue (16-22)  Black (23)")
+    jobs = [
+        FrameJob(f'{test_dir}/frame_{hour:02d}_{get_act(hour)}.png',
+                 hour, day_seed, 1200, 300)
+        for hour in range(24)
+    ]
+    for result in render_frames(jobs):
+        act = get_act(result.hour)
+        print(f"  h{result.hour:02d}  act={act:6s}  -> {result.path}")
+
+    print("=" * 55)
+    print(f"Done! 24 frames saved to '{test_dir}/'")
+    print("\nActs:  Yellow (0-7)  Red (8-15)  Blue (16-22)  Black (23)")
+
+
+if __name__ == '__main__':
+    main()